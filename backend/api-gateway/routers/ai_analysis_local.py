@@ -1017,11 +1017,11 @@ def _run_polis_analysis(responses: List[str], user_ids: List[str] = None):
     if not statements:
         raise HTTPException(status_code=500, detail="Failed to extract statements for analysis.")
 
-    # Step 2: For each individual response, map it against the list of extracted statements.
+    # Step 2: Map every response against the list of extracted statements, several responses per LLM call.
     # This determines whether a participant agrees, disagrees, or is neutral on each key statement.
+    mapping_results = ollama_client.map_responses_to_statements_batch(responses, statements)
     user_statement_matrix = []
-    for i, response_text in enumerate(responses):
-        mapping_result = ollama_client.map_response_to_statements(response_text, statements)
+    for i, (response_text, mapping_result) in enumerate(zip(responses, mapping_results)):
         # Use actual user_id if available, otherwise fall back to index-based ID
         actual_user_id = user_ids[i] if user_ids and i < len(user_ids) else f"participant_{i+1}"
         user_statement_matrix.append({
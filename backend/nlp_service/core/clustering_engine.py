@@ -7,12 +7,18 @@ import numpy as np
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 import logging
-from sklearn.cluster import KMeans, DBSCAN
+from sklearn.cluster import KMeans, MiniBatchKMeans, DBSCAN, AgglomerativeClustering
 from sklearn.decomposition import PCA
 from sklearn.metrics import silhouette_score
 from sklearn.preprocessing import StandardScaler
 import json
 
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
 @dataclass
 class ClusterConfig:
     """Configuration for clustering algorithms"""
@@ -23,6 +29,9 @@ class ClusterConfig:
     random_state: int = 42
     max_iter: int = 300
     n_init: int = 10
+    backend: str = "auto"  # K-means implementation: auto, sklearn, minibatch, faiss
+    large_n_threshold: int = 2000  # auto switches off exact sklearn KMeans from this many responses
+    faiss_niter: int = 20  # Lloyd iterations per FAISS K-means run
 
 @dataclass
 class ClusterResult:
@@ -42,40 +51,43 @@ class ClusteringEngine:
     
     def __init__(self, config: Optional[ClusterConfig] = None):
         """Initialize clustering engine"""
+        # Default configuration; each call may pass its own. Fitted models are local
+        # to the call, so one engine can serve concurrent requests.
         self.config = config or ClusterConfig()
-        self.scaler = StandardScaler()
-        self.pca = None
-        self.model = None
-        self.embeddings = None
-        self.labels = None
         
-    def cluster_responses(self, responses: List[str], embeddings: List[np.ndarray]) -> Dict[str, Any]:
+    def cluster_responses(self, responses: List[str], embeddings: List[np.ndarray],
+                          config: Optional[ClusterConfig] = None) -> Dict[str, Any]:
         """
         Cluster responses based on their embeddings
         
         Args:
             responses: List of response texts
             embeddings: List of embedding vectors
+            config: Configuration for this call (defaults to the engine's config)
             
         Returns:
             Dictionary with clustering results
         """
+        config = config or self.config
+        
         if len(responses) < 2:
-            return self._empty_clustering_result(responses)
+            return self._empty_clustering_result(responses, config)
         
-        # Convert embeddings to numpy array
-        embeddings_array = np.array(embeddings)
+        # Convert embeddings to numpy array (upcast from the float16 storage dtype)
+        embeddings_array = np.array(embeddings, dtype=np.float32)
         
         # Determine optimal number of clusters
-        optimal_k = self._determine_optimal_clusters(embeddings_array, responses)
+        optimal_k = self._determine_optimal_clusters(embeddings_array, responses, config)
         
         # Perform clustering
-        if self.config.algorithm == "kmeans":
-            clusters = self._kmeans_clustering(embeddings_array, responses, optimal_k)
-        elif self.config.algorithm == "dbscan":
-            clusters = self._dbscan_clustering(embeddings_array, responses)
+        if config.algorithm == "kmeans":
+            clusters = self._kmeans_clustering(embeddings_array, responses, optimal_k, config)
+        elif config.algorithm == "dbscan":
+            clusters = self._dbscan_clustering(embeddings_array, responses, config)
+        elif config.algorithm == "hierarchical":
+            clusters = self._hierarchical_clustering(embeddings_array, responses, optimal_k, config)
         else:
-            clusters = self._kmeans_clustering(embeddings_array, responses, optimal_k)
+            clusters = self._kmeans_clustering(embeddings_array, responses, optimal_k, config)
         
         # Calculate cluster statistics
         cluster_stats = self._calculate_cluster_statistics(clusters, embeddings_array)
@@ -89,11 +101,11 @@ class ClusteringEngine:
             "consensus_areas": consensus_areas,
             "total_responses": len(responses),
             "total_clusters": len(clusters),
-            "algorithm_used": self.config.algorithm,
+            "algorithm_used": config.algorithm,
             "optimal_clusters": optimal_k
         }
     
-    def _determine_optimal_clusters(self, embeddings: np.ndarray, responses: List[str]) -> int:
+    def _determine_optimal_clusters(self, embeddings: np.ndarray, responses: List[str], config: ClusterConfig) -> int:
         """Determine optimal number of clusters using silhouette analysis"""
         if len(embeddings) < 4:
             return min(2, len(embeddings))
@@ -107,8 +119,7 @@ class ClusteringEngine:
         
         for k in range(2, max_k + 1):
             try:
-                kmeans = KMeans(n_clusters=k, random_state=self.config.random_state, n_init=self.config.n_init)
-                labels = kmeans.fit_predict(embeddings)
+                _, labels = self._fit_kmeans(embeddings, k, config)
                 
                 if len(set(labels)) > 1:  # At least 2 clusters
                     score = silhouette_score(embeddings, labels)
@@ -121,35 +132,36 @@ class ClusteringEngine:
         
         return optimal_k
     
-    def _kmeans_clustering(self, embeddings: np.ndarray, responses: List[str], n_clusters: int) -> List[ClusterResult]:
+    def _kmeans_clustering(self, embeddings: np.ndarray, responses: List[str], n_clusters: int,
+                           config: ClusterConfig) -> List[ClusterResult]:
         """Perform K-means clustering"""
-        # Standardize embeddings
-        embeddings_scaled = self.scaler.fit_transform(embeddings)
-        
-        # Apply PCA for dimensionality reduction if needed
-        if embeddings_scaled.shape[1] > 50:
-            self.pca = PCA(n_components=min(50, len(embeddings_scaled) - 1))
-            embeddings_reduced = self.pca.fit_transform(embeddings_scaled)
-        else:
-            embeddings_reduced = embeddings_scaled
+        embeddings_reduced = self._reduce(embeddings)
         
         # Perform K-means clustering
-        self.model = KMeans(
-            n_clusters=n_clusters,
-            random_state=self.config.random_state,
-            n_init=self.config.n_init,
-            max_iter=self.config.max_iter
-        )
+        _, labels = self._fit_kmeans(embeddings_reduced, n_clusters, config)
+        
+        return self._group_clusters(labels, responses, embeddings_reduced, config)
+    
+    def _hierarchical_clustering(self, embeddings: np.ndarray, responses: List[str], n_clusters: int,
+                                 config: ClusterConfig) -> List[ClusterResult]:
+        """Perform agglomerative (Ward linkage) clustering"""
+        embeddings_reduced = self._reduce(embeddings)
         
-        self.labels = self.model.fit_predict(embeddings_reduced)
-        self.embeddings = embeddings_reduced
+        labels = AgglomerativeClustering(n_clusters=n_clusters, linkage="ward").fit_predict(embeddings_reduced)
         
-        # Group responses by cluster
+        return self._group_clusters(labels, responses, embeddings_reduced, config)
+    
+    def _group_clusters(self, labels: np.ndarray, responses: List[str], embeddings_reduced: np.ndarray,
+                        config: ClusterConfig) -> List[ClusterResult]:
+        """Group responses by cluster label, skipping noise (-1) and clusters below min_cluster_size"""
         clusters = []
-        for cluster_id in range(n_clusters):
-            cluster_indices = np.where(self.labels == cluster_id)[0]
+        for cluster_id in sorted(set(labels.tolist())):
+            if cluster_id == -1:  # Noise points
+                continue
+            
+            cluster_indices = np.where(labels == cluster_id)[0]
             
-            if len(cluster_indices) < self.config.min_cluster_size:
+            if len(cluster_indices) < config.min_cluster_size:
                 continue
             
             cluster_responses = [responses[i] for i in cluster_indices]
@@ -176,59 +188,79 @@ class ClusteringEngine:
         
         return clusters
     
-    def _dbscan_clustering(self, embeddings: np.ndarray, responses: List[str]) -> List[ClusterResult]:
-        """Perform DBSCAN clustering"""
-        # Standardize embeddings
-        embeddings_scaled = self.scaler.fit_transform(embeddings)
+    def _reduce(self, embeddings: np.ndarray) -> np.ndarray:
+        """Standardize embeddings and PCA-reduce them to at most 50 dimensions"""
+        embeddings_scaled = StandardScaler().fit_transform(embeddings)
         
-        # Apply PCA for dimensionality reduction if needed
         if embeddings_scaled.shape[1] > 50:
-            self.pca = PCA(n_components=min(50, len(embeddings_scaled) - 1))
-            embeddings_reduced = self.pca.fit_transform(embeddings_scaled)
+            pca = PCA(n_components=min(50, len(embeddings_scaled) - 1))
+            return pca.fit_transform(embeddings_scaled)
+        return embeddings_scaled
+    
+    def _kmeans_backend(self, n_samples: int, config: ClusterConfig) -> str:
+        """Resolve ClusterConfig.backend, picking a scalable implementation for large inputs under auto"""
+        backend = config.backend
+        if backend == "faiss" and not FAISS_AVAILABLE:
+            logging.warning("FAISS not available, falling back to MiniBatchKMeans")
+            return "minibatch"
+        if backend != "auto":
+            return backend
+        if n_samples < config.large_n_threshold:
+            return "sklearn"
+        return "faiss" if FAISS_AVAILABLE else "minibatch"
+    
+    def _fit_kmeans(self, embeddings: np.ndarray, n_clusters: int, config: ClusterConfig) -> Tuple[Any, np.ndarray]:
+        """
+        Fit K-means with the configured backend
+        
+        Args:
+            embeddings: (N, D) matrix to cluster
+            n_clusters: Number of clusters
+            config: Clustering configuration
+            
+        Returns:
+            Tuple of (fitted model, label per row)
+        """
+        backend = self._kmeans_backend(len(embeddings), config)
+        
+        if backend == "faiss":
+            data = np.ascontiguousarray(embeddings, dtype=np.float32)
+            model = faiss.Kmeans(
+                data.shape[1], n_clusters,
+                niter=config.faiss_niter,
+                nredo=config.n_init,
+                seed=config.random_state,
+                gpu=faiss.get_num_gpus() > 0
+            )
+            model.train(data)
+            _, labels = model.index.search(data, 1)
+            return model, labels.ravel()
+        
+        if backend == "minibatch":
+            model = MiniBatchKMeans(
+                n_clusters=n_clusters,
+                random_state=config.random_state,
+                n_init=config.n_init,
+                max_iter=config.max_iter,
+                batch_size=1024
+            )
         else:
-            embeddings_reduced = embeddings_scaled
+            model = KMeans(
+                n_clusters=n_clusters,
+                random_state=config.random_state,
+                n_init=config.n_init,
+                max_iter=config.max_iter
+            )
+        return model, model.fit_predict(embeddings)
+    
+    def _dbscan_clustering(self, embeddings: np.ndarray, responses: List[str], config: ClusterConfig) -> List[ClusterResult]:
+        """Perform DBSCAN clustering"""
+        embeddings_reduced = self._reduce(embeddings)
         
         # Perform DBSCAN clustering
-        self.model = DBSCAN(eps=self.config.eps, min_samples=self.config.min_cluster_size)
-        self.labels = self.model.fit_predict(embeddings_reduced)
-        self.embeddings = embeddings_reduced
-        
-        # Group responses by cluster
-        clusters = []
-        unique_labels = set(self.labels)
+        labels = DBSCAN(eps=config.eps, min_samples=config.min_cluster_size).fit_predict(embeddings_reduced)
         
-        for cluster_id in unique_labels:
-            if cluster_id == -1:  # Noise points
-                continue
-                
-            cluster_indices = np.where(self.labels == cluster_id)[0]
-            
-            if len(cluster_indices) < self.config.min_cluster_size:
-                continue
-            
-            cluster_responses = [responses[i] for i in cluster_indices]
-            cluster_embeddings = embeddings_reduced[cluster_indices]
-            
-            # Calculate centroid
-            centroid = np.mean(cluster_embeddings, axis=0).tolist()
-            
-            # Calculate coherence score
-            coherence = self._calculate_cluster_coherence(cluster_embeddings)
-            
-            # Find representative text
-            representative = self._find_representative_text(cluster_responses, cluster_embeddings, centroid)
-            
-            clusters.append(ClusterResult(
-                cluster_id=cluster_id,
-                centroid=centroid,
-                responses=cluster_responses,
-                response_indices=cluster_indices.tolist(),
-                size=len(cluster_responses),
-                coherence_score=coherence,
-                representative_text=representative
-            ))
-        
-        return clusters
+        return self._group_clusters(labels, responses, embeddings_reduced, config)
     
     def _calculate_cluster_coherence(self, cluster_embeddings: np.ndarray) -> float:
         """Calculate coherence score for a cluster"""
@@ -242,7 +274,8 @@ class ClusteringEngine:
                 similarity = self._cosine_similarity(cluster_embeddings[i], cluster_embeddings[j])
                 similarities.append(similarity)
         
-        return np.mean(similarities) if similarities else 0.0
+        # float() so the score is JSON-serializable (np.float32 is not a float subclass)
+        return float(np.mean(similarities)) if similarities else 0.0
     
     def _find_representative_text(self, responses: List[str], embeddings: np.ndarray, centroid: List[float]) -> str:
         """Find the most representative text in a cluster"""
@@ -284,12 +317,12 @@ class ClusteringEngine:
         
         return {
             "total_clusters": len(clusters),
-            "average_cluster_size": np.mean(cluster_sizes),
+            "average_cluster_size": float(np.mean(cluster_sizes)),
             "min_cluster_size": min(cluster_sizes),
             "max_cluster_size": max(cluster_sizes),
-            "average_coherence": np.mean(coherence_scores),
-            "min_coherence": min(coherence_scores),
-            "max_coherence": max(coherence_scores),
+            "average_coherence": float(np.mean(coherence_scores)),
+            "min_coherence": float(min(coherence_scores)),
+            "max_coherence": float(max(coherence_scores)),
             "cluster_size_distribution": {
                 "small": len([s for s in cluster_sizes if s <= 3]),
                 "medium": len([s for s in cluster_sizes if 3 < s <= 10]),
@@ -313,7 +346,7 @@ class ClusteringEngine:
                 "representative_text": cluster.representative_text,
                 "coherence_score": cluster.coherence_score,
                 "size": cluster.size,
-                "consensus_strength": cluster.coherence_score * np.log(cluster.size + 1)
+                "consensus_strength": float(cluster.coherence_score * np.log(cluster.size + 1))
             })
         
         # Sort by consensus strength
@@ -321,7 +354,7 @@ class ClusteringEngine:
         
         return consensus_areas
     
-    def _empty_clustering_result(self, responses: List[str]) -> Dict[str, Any]:
+    def _empty_clustering_result(self, responses: List[str], config: ClusterConfig) -> Dict[str, Any]:
         """Return empty clustering result for insufficient data"""
         return {
             "clusters": [],
@@ -338,7 +371,7 @@ class ClusteringEngine:
             "consensus_areas": [],
             "total_responses": len(responses),
             "total_clusters": 0,
-            "algorithm_used": self.config.algorithm,
+            "algorithm_used": config.algorithm,
             "optimal_clusters": 0
         }
     
@@ -0,0 +1,126 @@
+"""
+Dynamic Request Batcher
+Coalesces concurrent single-item requests into one batched model call
+"""
+
+import asyncio
+import logging
+from concurrent.futures import Executor
+from typing import Any, Callable, List, Optional, Tuple
+
+MAX_BATCH_SIZE = 32
+
+class DynamicBatcher:
+    """
+    Collects items submitted from concurrent requests for up to max_wait_ms,
+    runs a single batch function over them and resolves each caller's future
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Any]], List[Any]],
+                 max_batch_size: int = MAX_BATCH_SIZE,
+                 max_wait_ms: float = 5.0,
+                 max_queue_size: int = 1024,
+                 executor: Optional[Executor] = None):
+        """
+        Args:
+            batch_fn: Blocking function mapping a list of items to a list of results
+            max_batch_size: Largest batch handed to batch_fn
+            max_wait_ms: How long to wait for more items after the first arrives
+            max_queue_size: Pending items allowed before submit() blocks
+            executor: Executor batch_fn runs on (the loop default when None)
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_queue_size = max_queue_size
+        self.executor = executor
+        self.logger = logging.getLogger(__name__)
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def _ensure_started(self):
+        """Start the worker task on the running loop the first time it is needed"""
+        if self._worker is None or self._worker.done():
+            # A restarted worker keeps the existing queue, so items already waiting in it still complete
+            if self._queue is None:
+                self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, item: Any) -> Any:
+        """
+        Queue an item and wait for its result
+
+        Args:
+            item: Single input for batch_fn
+
+        Returns:
+            The result batch_fn produced for this item
+        """
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        # Blocks when the queue is full, pushing back on callers
+        await self._queue.put((item, future))
+        return await future
+
+    async def close(self):
+        """Stop the worker task, failing anything still queued"""
+        if self._worker is None:
+            return
+
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Batcher closed"))
+
+    async def _collect(self) -> List[Tuple[Any, asyncio.Future]]:
+        """Wait for one item, then gather more until the batch is full or the wait expires"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self):
+        """Worker loop: collect a batch, run it, fan results back out"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = await self._collect()
+            # Callers that gave up (e.g. client disconnects) don't need computing
+            batch = [(item, future) for item, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            items = [item for item, _ in batch]
+            try:
+                results = list(await loop.run_in_executor(self.executor, self.batch_fn, items))
+                if len(results) != len(batch):
+                    # Results can't be matched to items, so none of them are handed out
+                    raise RuntimeError(f"batch_fn returned {len(results)} results for {len(batch)} items")
+            except Exception as e:
+                self.logger.error(f"Batch of {len(items)} failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
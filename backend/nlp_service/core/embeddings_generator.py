@@ -3,6 +3,10 @@ BERT Embeddings Generator for Semantic Text Analysis
 Generates dense vector representations for text similarity and clustering
 """
 
+import math
+import hashlib
+import threading
+from collections import OrderedDict
 import numpy as np
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
@@ -10,6 +14,7 @@ import logging
 
 # Try to import transformers, fallback to sentence-transformers if available
 try:
+    import transformers
     from transformers import AutoTokenizer, AutoModel
     import torch
     TRANSFORMERS_AVAILABLE = True
@@ -22,10 +27,31 @@ try:
 except ImportError:
     SENTENCE_TRANSFORMERS_AVAILABLE = False
 
+try:
+    import simsimd
+    SIMSIMD_AVAILABLE = True
+except ImportError:
+    SIMSIMD_AVAILABLE = False
+
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
 # Fallback to basic word embeddings
 from sklearn.feature_extraction.text import TfidfVectorizer
 import pickle
 import os
+import tempfile
+
+# Raw Transformers model used when sentence-transformers is unavailable
+TRANSFORMERS_MODEL_NAME = "distilbert-base-uncased"
+
+def _default_cache_dir() -> str:
+    """Per-user directory for exported model artifacts (NLP_SERVICE_CACHE_DIR overrides)"""
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.getenv("NLP_SERVICE_CACHE_DIR") or os.path.join(base, "cosenseus-nlp")
 
 @dataclass
 class EmbeddingConfig:
@@ -36,6 +62,15 @@ class EmbeddingConfig:
     use_gpu: bool = False
     normalize_embeddings: bool = True
     pooling_strategy: str = "mean"  # mean, max, cls
+    quantize: bool = True  # int8 dynamic quantization on CPU, half precision on GPU
+    compile_model: bool = True  # torch.compile the encoder on GPU during warmup()
+    gpu_dtype: str = "float16"  # half-precision type on GPU: float16 or bfloat16 (raw Transformers only)
+    num_threads: Optional[int] = None  # torch intra-op threads; None -> min(8, cpu count)
+    use_onnx: bool = True  # run the raw Transformers model through ONNX Runtime on CPU
+    onnx_path: Optional[str] = None  # None -> per-user cache file keyed by model and library versions
+    storage_dtype: str = "float16"  # dtype of returned/stored embeddings; math upcasts to float32
+    cache_size: int = 10000  # exact-match embedding cache entries; 0 disables
+    candidate_cache_size: int = 8  # normalized candidate matrices kept for repeated searches
 
 class EmbeddingsGenerator:
     """
@@ -50,6 +85,14 @@ class EmbeddingsGenerator:
         self.tokenizer = None
         self.embedding_dim = None
         self.model_type = None
+        self.device = None
+        self._ort_session = None
+        
+        # Exact-match cache: blake2b(text) -> read-only embedding, in LRU order
+        self._cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Search: hash of the candidate list -> read-only normalized (N, D) float32 matrix
+        self._candidate_matrices: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
         
         # Initialize the best available model
         self._initialize_model()
@@ -57,12 +100,19 @@ class EmbeddingsGenerator:
     def _initialize_model(self):
         """Initialize the best available embedding model"""
         
+        if TRANSFORMERS_AVAILABLE:
+            use_cuda = self.config.use_gpu and torch.cuda.is_available()
+            self.device = torch.device('cuda' if use_cuda else 'cpu')
+            torch.set_num_threads(self.config.num_threads or min(8, os.cpu_count() or 4))
+        
         # Try Sentence Transformers first (easiest)
         if SENTENCE_TRANSFORMERS_AVAILABLE:
             try:
                 self.model = SentenceTransformer(self.config.model_name)
                 self.embedding_dim = self.model.get_sentence_embedding_dimension()
                 self.model_type = "sentence_transformers"
+                self.model.to(self.device)
+                self._quantize_model()
                 logging.info(f"Initialized Sentence Transformers model: {self.config.model_name}")
                 return
             except Exception as e:
@@ -71,10 +121,14 @@ class EmbeddingsGenerator:
         # Try direct Transformers library
         if TRANSFORMERS_AVAILABLE:
             try:
-                self.tokenizer = AutoTokenizer.from_pretrained('distilbert-base-uncased')
-                self.model = AutoModel.from_pretrained('distilbert-base-uncased')
+                self.tokenizer = AutoTokenizer.from_pretrained(TRANSFORMERS_MODEL_NAME)
+                self.model = AutoModel.from_pretrained(TRANSFORMERS_MODEL_NAME)
                 self.embedding_dim = self.model.config.hidden_size
                 self.model_type = "transformers"
+                self.model.to(self.device)
+                # ORT applies its own graph optimizations; only quantize the eager model
+                if not self._initialize_onnx_session():
+                    self._quantize_model()
                 logging.info("Initialized DistilBERT model via Transformers")
                 return
             except Exception as e:
@@ -83,6 +137,94 @@ class EmbeddingsGenerator:
         # Fallback to TF-IDF
         self._initialize_tfidf_fallback()
         
+    def _quantize_model(self):
+        """Reduce model precision: FP16/BF16 on GPU, dynamic int8 Linear layers on CPU"""
+        if not self.config.quantize:
+            return
+        
+        try:
+            if self.device.type == 'cuda':
+                # sentence-transformers converts outputs with .numpy(), which has no bfloat16
+                use_bf16 = (
+                    self.config.gpu_dtype == "bfloat16"
+                    and self.model_type == "transformers"
+                    and torch.cuda.is_bf16_supported()
+                )
+                self.model = self.model.to(torch.bfloat16 if use_bf16 else torch.float16)
+            elif self.model_type == "sentence_transformers":
+                self.model[0].auto_model = torch.quantization.quantize_dynamic(
+                    self.model[0].auto_model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+            else:
+                self.model = torch.quantization.quantize_dynamic(
+                    self.model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+        except Exception as e:
+            logging.warning(f"Model quantization failed, using full precision: {e}")
+        
+    def _initialize_onnx_session(self) -> bool:
+        """Export the Transformers model to ONNX and open an optimized ORT session"""
+        if not (self.config.use_onnx and ONNXRUNTIME_AVAILABLE) or self.device.type != 'cpu':
+            return False
+        
+        try:
+            onnx_path = self.config.onnx_path or self._default_onnx_path()
+            if not os.path.exists(onnx_path):
+                self._export_onnx(onnx_path)
+            
+            sess_options = ort.SessionOptions()
+            sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            self._ort_session = ort.InferenceSession(
+                onnx_path,
+                sess_options=sess_options,
+                providers=['CPUExecutionProvider']
+            )
+            logging.info(f"Running Transformers embeddings via ONNX Runtime: {onnx_path}")
+            return True
+        except Exception as e:
+            logging.warning(f"ONNX export failed, using PyTorch eager model: {e}")
+            self._ort_session = None
+            return False
+        
+    def _default_onnx_path(self) -> str:
+        """
+        Export location in the per-user cache, keyed by model and library versions so a
+        different model or an older export is never reused
+        """
+        cache_dir = _default_cache_dir()
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        name = (
+            f"{TRANSFORMERS_MODEL_NAME.replace('/', '--')}"
+            f"-transformers{transformers.__version__}-torch{torch.__version__}.onnx"
+        )
+        return os.path.join(cache_dir, name)
+    
+    def _export_onnx(self, onnx_path: str):
+        """Export the Transformers model to a temp file and move it into place atomically"""
+        # Concurrent workers each write their own temp file; os.replace makes the last one win whole
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(onnx_path) or ".", suffix=".onnx.tmp")
+        os.close(fd)
+        try:
+            dummy = self.tokenizer("sample civic text", return_tensors='pt')
+            torch.onnx.export(
+                self.model,
+                (dummy['input_ids'], dummy['attention_mask']),
+                tmp_path,
+                input_names=['input_ids', 'attention_mask'],
+                output_names=['last_hidden_state'],
+                dynamic_axes={
+                    'input_ids': {0: 'batch', 1: 'sequence'},
+                    'attention_mask': {0: 'batch', 1: 'sequence'},
+                    'last_hidden_state': {0: 'batch', 1: 'sequence'}
+                },
+                opset_version=17
+            )
+            os.replace(tmp_path, onnx_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
     def _initialize_tfidf_fallback(self):
         """Initialize TF-IDF as fallback embedding method"""
         self.model = TfidfVectorizer(
@@ -90,7 +232,8 @@ class EmbeddingsGenerator:
             stop_words='english',
             ngram_range=(1, 2),
             min_df=1,
-            max_df=0.95
+            max_df=0.95,
+            norm='l2' if self.config.normalize_embeddings else None  # normalized on the sparse output
         )
         self.embedding_dim = 300
         self.model_type = "tfidf"
@@ -108,14 +251,21 @@ class EmbeddingsGenerator:
             NumPy array of embedding vector
         """
         if not text or not isinstance(text, str):
-            return np.zeros(self.embedding_dim)
+            return np.zeros(self.embedding_dim, dtype=self.config.storage_dtype)
+        
+        key = self._cache_key(text)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
         
         if self.model_type == "sentence_transformers":
-            return self._generate_sentence_transformer_embedding(text)
+            embedding = self._generate_sentence_transformer_embedding(text)
         elif self.model_type == "transformers":
-            return self._generate_transformer_embedding(text)
+            embedding = self._generate_transformer_embedding(text)
         else:  # tfidf
-            return self._generate_tfidf_embedding(text)
+            embedding = self._generate_tfidf_embedding(text)
+        
+        return self._cache_put(key, self._to_storage_dtype(embedding))
     
     def generate_embeddings_batch(self, texts: List[str]) -> List[np.ndarray]:
         """
@@ -130,13 +280,141 @@ class EmbeddingsGenerator:
         if not texts:
             return []
         
+        keys = [self._cache_key(text) for text in texts]
+        results = [self._cache_get(key) for key in keys]
+        
+        # Only unseen texts go to the model, each distinct one once
+        missing = list(dict.fromkeys(
+            (key, text) for key, text, result in zip(keys, texts, results) if result is None
+        ))
+        if not missing:
+            return results
+        
+        missing_texts = [text for _, text in missing]
         if self.model_type == "sentence_transformers":
-            embeddings = self.model.encode(texts, convert_to_numpy=True)
-            return [emb for emb in embeddings]
+            embeddings = self._generate_sentence_transformer_batch(missing_texts)
         elif self.model_type == "transformers":
-            return [self._generate_transformer_embedding(text) for text in texts]
+            embeddings = self._generate_transformer_batch(missing_texts)
         else:  # tfidf
-            return self._generate_tfidf_batch(texts)
+            embeddings = self._generate_tfidf_batch(missing_texts)
+        
+        computed = {
+            key: self._cache_put(key, self._to_storage_dtype(embedding))
+            for (key, _), embedding in zip(missing, embeddings)
+        }
+        return [result if result is not None else computed[key] for key, result in zip(keys, results)]
+    
+    def prefit_corpus(self, texts: List[str]):
+        """
+        Fit the TF-IDF fallback vocabulary once on a representative corpus
+        
+        Args:
+            texts: Corpus to learn the vocabulary and IDF weights from
+        """
+        if self.model_type != "tfidf" or not texts:
+            return
+        
+        try:
+            self.model.fit(texts)
+        except ValueError as e:
+            # e.g. the corpus contains only stop words
+            logging.warning(f"Could not fit TF-IDF vocabulary: {e}")
+            return
+        
+        self.embedding_dim = len(self.model.vocabulary_)
+        self._tfidf_fitted = True
+        self.clear_cache()  # Embeddings from the previous vocabulary no longer apply
+    
+    def warmup(self, batch_size: int = 8):
+        """
+        Run a throwaway forward pass so lazy initialization (and torch.compile, when
+        enabled) happens before the first real request
+        
+        Args:
+            batch_size: Number of dummy texts in the warmup batch
+        """
+        if self.model_type == "tfidf":
+            # Fitting on dummy text would replace the vocabulary; nothing to warm
+            return
+        
+        self._compile_model()
+        
+        # Bypass the embedding cache so every call actually reaches the model
+        texts = ["warmup"] * batch_size
+        if self.model_type == "sentence_transformers":
+            self._generate_sentence_transformer_batch(texts)
+        else:
+            self._generate_transformer_batch(texts)
+    
+    def _compile_model(self):
+        """torch.compile the encoder; CUDA graphs only pay off on GPU"""
+        if not (self.config.compile_model and self.device is not None and self.device.type == 'cuda'):
+            return
+        if not hasattr(torch, "compile") or self._ort_session is not None:
+            return
+        
+        try:
+            if self.model_type == "sentence_transformers":
+                self.model[0].auto_model = torch.compile(self.model[0].auto_model, mode="reduce-overhead")
+            else:
+                self.model = torch.compile(self.model, mode="reduce-overhead")
+        except Exception as e:
+            logging.warning(f"torch.compile failed, using eager model: {e}")
+    
+    def clear_cache(self):
+        """Drop all cached embeddings"""
+        with self._cache_lock:
+            self._cache.clear()
+            self._candidate_matrices.clear()
+    
+    def save_cache(self, path: str):
+        """
+        Persist the embedding cache so it survives restarts
+        
+        Args:
+            path: Destination .npz file
+        """
+        with self._cache_lock:
+            keys = list(self._cache.keys())
+            embeddings = list(self._cache.values())
+        
+        np.savez(
+            path,
+            model=np.array(self._cache_identity()),
+            # Raw (N, 16) bytes: an "S16" array would strip digests' trailing NUL bytes
+            keys=np.frombuffer(b"".join(keys), dtype=np.uint8).reshape(-1, 16),
+            embeddings=np.stack(embeddings) if embeddings else np.empty((0, self.embedding_dim or 0))
+        )
+    
+    def load_cache(self, path: str) -> int:
+        """
+        Load a cache written by save_cache
+        
+        Args:
+            path: .npz file to read
+            
+        Returns:
+            Number of entries loaded (0 if the file was written for a different model)
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Cache file not found: {path}")
+        
+        with np.load(path, allow_pickle=False) as data:
+            if str(data["model"]) != self._cache_identity():
+                logging.warning(f"Ignoring embedding cache {path}: written for a different model")
+                return 0
+            keys = data["keys"]
+            embeddings = data["embeddings"]
+        
+        if keys.dtype.kind == "S":
+            # Older files stored "S16" keys, which lost trailing NULs; digests are fixed-length, so pad them back
+            keys = [bytes(key).ljust(16, b"\0") for key in keys]
+        else:
+            keys = [row.tobytes() for row in keys]
+        
+        for key, embedding in zip(keys, embeddings):
+            self._cache_put(key, embedding.astype(self.config.storage_dtype))
+        return len(keys)
     
     def compute_similarity(self, text1: str, text2: str) -> float:
         """
@@ -166,115 +444,259 @@ class EmbeddingsGenerator:
         Returns:
             List of (text, similarity_score) tuples
         """
-        query_embedding = self.generate_embedding(query_text)
-        similarities = []
-        
+        if not candidate_texts or top_k <= 0:
+            return []
+
+        # Candidates are embedded first so the TF-IDF fallback fits on them, not the query
+        candidate_matrix = self._candidate_matrix(candidate_texts)
+        query = self._normalized_query(query_text)
+
+        scores = np.clip(candidate_matrix @ query, 0.0, 1.0)  # Clamp to [0, 1]
+
+        # Partial selection of the top_k candidates, then sort only those
+        top_k = min(top_k, len(scores))
+        if top_k < len(scores):
+            top_indices = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            top_indices = np.arange(len(scores))
+        top_indices = top_indices[np.argsort(-scores[top_indices], kind="stable")]
+
+        return [(candidate_texts[i], float(scores[i])) for i in top_indices]
+    
+    def _normalized_query(self, query_text: str) -> np.ndarray:
+        """Embed the query as a unit-length float32 vector"""
+        query = np.asarray(self.generate_embedding(query_text), dtype=np.float32)
+        return query / (np.linalg.norm(query) + 1e-12)
+    
+    def _candidate_key(self, candidate_texts: List[str]) -> bytes:
+        """Digest identifying an ordered candidate list"""
+        hasher = hashlib.blake2b(digest_size=16)
         for text in candidate_texts:
-            text_embedding = self.generate_embedding(text)
-            similarity = self._cosine_similarity(query_embedding, text_embedding)
-            similarities.append((text, similarity))
-        
-        # Sort by similarity descending
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        
-        return similarities[:top_k]
+            hasher.update(self._cache_key(text))
+        return hasher.digest()
+    
+    def _candidate_matrix(self, candidate_texts: List[str], key: Optional[bytes] = None) -> np.ndarray:
+        """
+        Stack candidates into one pre-normalized (N, D) float32 matrix so scoring is a
+        single matmul, reusing the matrix when the same candidate list is searched again
+        """
+        key = key or self._candidate_key(candidate_texts)
+        
+        with self._cache_lock:
+            matrix = self._candidate_matrices.get(key)
+            if matrix is not None:
+                self._candidate_matrices.move_to_end(key)
+                return matrix
+        
+        matrix = np.stack(self.generate_embeddings_batch(candidate_texts)).astype(np.float32)
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-12
+        
+        # Same rule as the embedding cache: don't keep placeholder TF-IDF zeros
+        if self.config.candidate_cache_size > 0 and (self.model_type != "tfidf" or self._tfidf_fitted):
+            matrix.flags.writeable = False
+            with self._cache_lock:
+                self._candidate_matrices[key] = matrix
+                if len(self._candidate_matrices) > self.config.candidate_cache_size:
+                    self._candidate_matrices.popitem(last=False)
+        return matrix
     
     def _generate_sentence_transformer_embedding(self, text: str) -> np.ndarray:
         """Generate embedding using Sentence Transformers"""
         embedding = self.model.encode([text], convert_to_numpy=True)[0]
         if self.config.normalize_embeddings:
-            embedding = embedding / np.linalg.norm(embedding)
+            embedding = self._normalize_inplace(embedding)
         return embedding
     
+    def _generate_sentence_transformer_batch(self, texts: List[str]) -> List[np.ndarray]:
+        """Generate Sentence Transformers embeddings for batch"""
+        embeddings = self.model.encode(texts, batch_size=self.config.batch_size, convert_to_numpy=True)
+        if self.config.normalize_embeddings:
+            self._normalize_rows_inplace(embeddings)
+        return [embedding for embedding in embeddings]
+    
     def _generate_transformer_embedding(self, text: str) -> np.ndarray:
         """Generate embedding using raw Transformers"""
-        # Tokenize
-        inputs = self.tokenizer(
-            text,
-            return_tensors='pt',
-            truncation=True,
-            padding=True,
-            max_length=self.config.max_length
-        )
+        embedding = self._encode_transformer([text])[0]
         
-        # Generate embeddings
-        with torch.no_grad():
-            outputs = self.model(**inputs)
+        if self.config.normalize_embeddings:
+            embedding = self._normalize_inplace(embedding)
             
-        # Use mean pooling of last hidden states
-        embeddings = outputs.last_hidden_state
-        attention_mask = inputs['attention_mask']
+        return embedding
+    
+    def _generate_transformer_batch(self, texts: List[str]) -> List[np.ndarray]:
+        """Generate raw Transformers embeddings for batch"""
+        embeddings = self._encode_transformer(texts)
+        if self.config.normalize_embeddings:
+            self._normalize_rows_inplace(embeddings)
+        return [embedding for embedding in embeddings]
+    
+    def tokenize_for_model(self, texts: List[str]) -> Dict[str, List[List[int]]]:
+        """
+        Tokenize texts for the raw Transformers model in one batched call, unpadded
+        
+        Args:
+            texts: Texts to tokenize
+            
+        Returns:
+            Encoding with input_ids and attention_mask lists, reusable with
+            generate_embeddings_from_tokens
+        """
+        if self.model_type != "transformers":
+            raise ValueError(f"Token input is not supported for {self.model_type} embeddings")
+        
+        return self.tokenizer(texts, truncation=True, padding=False, max_length=self.config.max_length)
+    
+    def generate_embeddings_from_tokens(self, encodings: Dict[str, List[List[int]]]) -> List[np.ndarray]:
+        """
+        Generate embeddings from tokenize_for_model output, skipping tokenization
         
-        # Mean pooling
-        input_mask_expanded = attention_mask.unsqueeze(-1).expand(embeddings.size()).float()
-        sum_embeddings = torch.sum(embeddings * input_mask_expanded, 1)
-        sum_mask = torch.clamp(input_mask_expanded.sum(1), min=1e-9)
-        embedding = (sum_embeddings / sum_mask).squeeze().numpy()
+        Args:
+            encodings: Encoding with input_ids and attention_mask
+            
+        Returns:
+            List of embedding vectors
+        """
+        if self.model_type != "transformers":
+            raise ValueError(f"Token input is not supported for {self.model_type} embeddings")
         
+        embeddings = self._encode_tokens(encodings)
         if self.config.normalize_embeddings:
-            embedding = embedding / np.linalg.norm(embedding)
+            self._normalize_rows_inplace(embeddings)
+        return [self._to_storage_dtype(embedding) for embedding in embeddings]
+    
+    def _encode_transformer(self, texts: List[str]) -> np.ndarray:
+        """Mean-pooled (N, D) embeddings for texts"""
+        return self._encode_tokens(self.tokenize_for_model(texts))
+    
+    def _encode_tokens(self, encodings: Dict[str, List[List[int]]]) -> np.ndarray:
+        """Mean-pooled (N, D) embeddings, one padded forward pass per batch_size chunk"""
+        batch_size = max(1, self.config.batch_size)
+        n_texts = len(encodings['input_ids'])
+        pooled_chunks = []
+        
+        for start in range(0, n_texts, batch_size):
+            # Pad only this chunk, to its own longest text
+            inputs = self.tokenizer.pad(
+                {
+                    'input_ids': encodings['input_ids'][start:start + batch_size],
+                    'attention_mask': encodings['attention_mask'][start:start + batch_size]
+                },
+                return_tensors='pt'
+            )
+            inputs = {k: v.to(self.device) for k, v in inputs.items()}
             
-        return embedding
+            # Generate embeddings
+            if self._ort_session is not None:
+                ort_inputs = {
+                    'input_ids': inputs['input_ids'].numpy(),
+                    'attention_mask': inputs['attention_mask'].numpy()
+                }
+                embeddings = torch.from_numpy(self._ort_session.run(None, ort_inputs)[0])
+            else:
+                with torch.inference_mode():
+                    outputs = self.model(**inputs)
+                embeddings = outputs.last_hidden_state
+            
+            # Pool in float32: half-precision sums over long sequences lose accuracy
+            embeddings = embeddings.float()
+            
+            # Mean pooling: masked sum over the sequence in one einsum
+            mask = inputs['attention_mask'].to(embeddings.dtype).unsqueeze(-1)
+            summed = torch.einsum('bsd,bse->bd', embeddings, mask)
+            counts = mask.sum(1).clamp(min=1e-9)
+            pooled_chunks.append((summed / counts).detach().cpu().numpy())
+        
+        if len(pooled_chunks) == 1:
+            return pooled_chunks[0]
+        return np.concatenate(pooled_chunks)
     
     def _generate_tfidf_embedding(self, text: str) -> np.ndarray:
         """Generate TF-IDF embedding (fallback)"""
         if not self._tfidf_fitted:
-            # Need to fit on some data first
-            sample_texts = [text, "sample civic text", "democracy community participation"]
-            self.model.fit(sample_texts)
-            self._tfidf_fitted = True
-        
-        try:
-            embedding = self.model.transform([text]).toarray()[0]
-        except:
-            # If transform fails, fit on current text
-            self.model.fit([text])
-            embedding = self.model.transform([text]).toarray()[0]
-            self._tfidf_fitted = True
-        
-        if self.config.normalize_embeddings:
-            norm = np.linalg.norm(embedding)
-            if norm > 0:
-                embedding = embedding / norm
+            # A single text is no corpus; wait for prefit_corpus or a batch call
+            return np.zeros(self.embedding_dim)
         
-        return embedding
+        return self.model.transform([text]).toarray()[0]
     
     def _generate_tfidf_batch(self, texts: List[str]) -> List[np.ndarray]:
         """Generate TF-IDF embeddings for batch"""
         if not self._tfidf_fitted:
-            self.model.fit(texts)
-            self._tfidf_fitted = True
-        
-        try:
-            embeddings = self.model.transform(texts).toarray()
-        except:
-            self.model.fit(texts)
-            embeddings = self.model.transform(texts).toarray()
-            self._tfidf_fitted = True
-        
-        result = []
-        for embedding in embeddings:
-            if self.config.normalize_embeddings:
-                norm = np.linalg.norm(embedding)
-                if norm > 0:
-                    embedding = embedding / norm
-            result.append(embedding)
+            self.prefit_corpus(texts)
+        if not self._tfidf_fitted:
+            return [np.zeros(self.embedding_dim) for _ in texts]
         
-        return result
+        embeddings = self.model.transform(texts).toarray()
+        return [embedding for embedding in embeddings]
+    
+    def _cache_key(self, text: str) -> bytes:
+        """Fixed-size digest of the text used as the cache key"""
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+    
+    def _cache_identity(self) -> str:
+        """Identifies the model a cached embedding came from"""
+        return f"{self.model_type}:{self.config.model_name}:{self.embedding_dim}"
+    
+    def _cache_get(self, key: bytes) -> Optional[np.ndarray]:
+        """Look up a cached embedding, marking it most recently used"""
+        with self._cache_lock:
+            embedding = self._cache.get(key)
+            if embedding is not None:
+                self._cache.move_to_end(key)
+            return embedding
+    
+    def _cache_put(self, key: bytes, embedding: np.ndarray) -> np.ndarray:
+        """Store an embedding, evicting the least recently used entry when full"""
+        # An unfitted TF-IDF model only produces placeholder zeros
+        if self.config.cache_size <= 0 or (self.model_type == "tfidf" and not self._tfidf_fitted):
+            return embedding
+        
+        # Cached arrays are shared between callers, so they must not be modified
+        embedding.flags.writeable = False
+        with self._cache_lock:
+            self._cache[key] = embedding
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.config.cache_size:
+                self._cache.popitem(last=False)
+        return embedding
+    
+    def _to_storage_dtype(self, embedding: np.ndarray) -> np.ndarray:
+        """Cast a (normalized) embedding to the configured storage dtype"""
+        return embedding.astype(self.config.storage_dtype, copy=False)
+    
+    def _normalize_inplace(self, vector: np.ndarray) -> np.ndarray:
+        """L2-normalize a vector in place (zero vectors stay zero)"""
+        squared_norm = float(np.dot(vector, vector))
+        scale = 1.0 / math.sqrt(squared_norm) if squared_norm > 0 else 0.0
+        np.multiply(vector, scale, out=vector)
+        return vector
+    
+    def _normalize_rows_inplace(self, matrix: np.ndarray) -> np.ndarray:
+        """L2-normalize each row of an (N, D) matrix in place (zero rows stay zero)"""
+        norms = np.sqrt(np.einsum('ij,ij->i', matrix, matrix))
+        matrix *= (1.0 / np.where(norms > 0, norms, 1.0))[:, None]
+        return matrix
     
     def _cosine_similarity(self, vec1: np.ndarray, vec2: np.ndarray) -> float:
         """Compute cosine similarity between two vectors"""
-        if len(vec1) == 0 or len(vec2) == 0:
-            return 0.0
-        
-        dot_product = np.dot(vec1, vec2)
-        norm1 = np.linalg.norm(vec1)
-        norm2 = np.linalg.norm(vec2)
-        
-        if norm1 == 0 or norm2 == 0:
+        vec1 = np.ascontiguousarray(vec1, dtype=np.float32)
+        vec2 = np.ascontiguousarray(vec2, dtype=np.float32)
+        
+        if SIMSIMD_AVAILABLE:
+            # Zero vectors have no direction; simsimd would report them as identical
+            if not (vec1.any() and vec2.any()):
+                return 0.0
+            # simsimd returns cosine distance from a fused SIMD kernel
+            similarity = 1.0 - float(simsimd.cosine(vec1, vec2))
+            return max(0.0, min(1.0, similarity))  # Clamp to [0, 1]
+        
+        # Single sqrt over the product of squared norms; empty vectors give 0
+        dot_product = float(np.vdot(vec1, vec2))
+        squared_norms = float(np.vdot(vec1, vec1) * np.vdot(vec2, vec2))
+        
+        if squared_norms <= 0:
             return 0.0
         
-        similarity = dot_product / (norm1 * norm2)
+        similarity = dot_product / math.sqrt(squared_norms)
         return max(0.0, min(1.0, similarity))  # Clamp to [0, 1]
     
     def get_embedding_info(self) -> Dict[str, Any]:
@@ -319,4 +741,6 @@ class EmbeddingsGenerator:
         
         if self.model_type == "tfidf" and "tfidf_model" in model_info:
             self.model = model_info["tfidf_model"]
-            self._tfidf_fitted = True 
\ No newline at end of file
+            self._tfidf_fitted = True
+        
+        self.clear_cache() 
\ No newline at end of file
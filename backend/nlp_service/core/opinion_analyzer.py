@@ -1,7 +1,11 @@
 import numpy as np
-from sklearn.decomposition import PCA
-from sklearn.cluster import KMeans
-from typing import List, Dict, Any
+import scipy.sparse
+from sklearn.decomposition import TruncatedSVD
+from sklearn.cluster import MiniBatchKMeans
+from typing import List, Dict, Any, Tuple
+
+# Numeric codes for a user's position on a statement; anything else is 0
+POSITION_CODES = {'agree': 1, 'disagree': -1}
 
 class OpinionAnalyzer:
     """
@@ -10,33 +14,49 @@ class OpinionAnalyzer:
     def __init__(self, n_clusters: int = 3, n_components: int = 2):
         self.n_clusters = n_clusters
         self.n_components = n_components
-        self.pca = PCA(n_components=self.n_components)
-        self.kmeans = KMeans(n_clusters=self.n_clusters, random_state=42, n_init=10)
+        self.svd = TruncatedSVD(n_components=self.n_components, random_state=42)
+        self.kmeans = MiniBatchKMeans(n_clusters=self.n_clusters, random_state=42, batch_size=256, n_init=3)
 
-    def _convert_to_numerical_matrix(self, user_statement_matrix: List[Dict[str, Any]], statements: List[str]) -> np.ndarray:
+    def _encode_positions(self, user_statement_matrix: List[Dict[str, Any]], statement_map: Dict[str, int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
-        Converts the list of user mappings into a NumPy matrix.
-        'agree' -> 1, 'disagree' -> -1, 'pass'/'neutral' -> 0.
+        Walks the user mappings once and returns parallel arrays
+        (user index, statement index, int8 position code) for every
+        'agree'/'disagree' cell. A later mapping for the same cell wins.
+        """
+        cells: Dict[Tuple[int, int], int] = {}
+
+        for user_index, user_data in enumerate(user_statement_matrix):
+            for mapping in user_data.get('mapping', []):
+                statement_index = statement_map.get(mapping.get('statement'))
+                if statement_index is None:
+                    continue
+                code = POSITION_CODES.get(mapping.get('position', 'pass').lower())
+                if code:
+                    cells[(user_index, statement_index)] = code
+
+        count = len(cells)
+        user_idx = np.fromiter((u for u, _ in cells), dtype=np.intp, count=count)
+        stmt_idx = np.fromiter((s for _, s in cells), dtype=np.intp, count=count)
+        values = np.fromiter(cells.values(), dtype=np.int8, count=count)
+        return user_idx, stmt_idx, values
+
+    def _convert_to_numerical_matrix(self, user_statement_matrix: List[Dict[str, Any]], statements: List[str]) -> scipy.sparse.csr_matrix:
+        """
+        Converts the list of user mappings into a sparse int8 CSR matrix.
+        'agree' -> 1, 'disagree' -> -1, 'pass'/'neutral' -> 0 (not stored).
         """
         statement_map = {statement: i for i, statement in enumerate(statements)}
         num_users = len(user_statement_matrix)
         num_statements = len(statements)
-        
-        matrix = np.zeros((num_users, num_statements))
 
-        for user_index, user_data in enumerate(user_statement_matrix):
-            for mapping in user_data.get('mapping', []):
-                statement_text = mapping.get('statement')
-                position = mapping.get('position', 'pass').lower()
-                
-                if statement_text in statement_map:
-                    statement_index = statement_map[statement_text]
-                    if position == 'agree':
-                        matrix[user_index, statement_index] = 1
-                    elif position == 'disagree':
-                        matrix[user_index, statement_index] = -1
+        user_idx, stmt_idx, values = self._encode_positions(user_statement_matrix, statement_map)
+        matrix = scipy.sparse.coo_matrix(
+            (values, (user_idx, stmt_idx)),
+            shape=(num_users, num_statements),
+            dtype=np.int8
+        )
         
-        return matrix
+        return matrix.tocsr()
 
     def analyze(self, user_statement_matrix: List[Dict[str, Any]], statements: List[str]) -> Dict[str, Any]:
         """
@@ -44,8 +64,8 @@ class OpinionAnalyzer:
         
         The process is as follows:
         1. Convert the input data into a numerical matrix.
-        2. Apply PCA to reduce the dimensionality of the data to 2D for visualization.
-        3. Apply K-Means clustering to the reduced data to group users by opinion.
+        2. Apply truncated SVD to the sparse matrix to reduce it to 2D for visualization.
+        3. Apply mini-batch K-Means clustering to the reduced data to group users by opinion.
         4. Combine the original user data with their new 2D coordinates and cluster ID.
         """
         if not user_statement_matrix:
@@ -53,13 +73,13 @@ class OpinionAnalyzer:
 
         numerical_matrix = self._convert_to_numerical_matrix(user_statement_matrix, statements)
         
-        # If we don't have enough data to perform PCA, return a simplified result
+        # If we don't have enough data to perform SVD, return a simplified result
         if self.n_components >= min(numerical_matrix.shape):
             clusters = np.zeros(numerical_matrix.shape[0], dtype=int)
             reduced_matrix = np.zeros((numerical_matrix.shape[0], self.n_components))
         else:
-            # Reduce dimensionality using PCA
-            reduced_matrix = self.pca.fit_transform(numerical_matrix)
+            # Reduce dimensionality with truncated SVD (upcast the int8 codes only here)
+            reduced_matrix = self.svd.fit_transform(numerical_matrix.astype(np.float32))
             # Perform K-Means clustering
             clusters = self.kmeans.fit_predict(reduced_matrix)
 
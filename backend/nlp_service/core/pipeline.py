@@ -0,0 +1,69 @@
+"""
+Fused NLP Pipeline
+Runs preprocessing, sentiment and embeddings over a batch in a single pass
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
+
+from core.text_processor import TextProcessor
+from core.sentiment_analyzer import SentimentAnalyzer
+from core.embeddings_generator import EmbeddingsGenerator
+
+class NLPPipeline:
+    """
+    Runs the per-text analysis stages of the complete-analysis endpoint together
+
+    The stages don't share a tokenizer (NLTK for preprocessing, a lexicon for
+    sentiment, the model's own tokenizer for embeddings), so instead of three
+    independent passes the pipeline deduplicates the batch once, keeps the
+    embedding forward pass running in the background while the lexical stages
+    walk the texts, and scatters the results back to input order.
+    """
+
+    def __init__(self, text_processor: TextProcessor, sentiment_analyzer: SentimentAnalyzer,
+                 embeddings_generator: EmbeddingsGenerator):
+        """Initialize pipeline over existing stage instances"""
+        self.text_processor = text_processor
+        self.sentiment_analyzer = sentiment_analyzer
+        self.embeddings_generator = embeddings_generator
+        self.logger = logging.getLogger(__name__)
+
+        # Dedicated thread so the embedding pass overlaps the lexical stages
+        # without competing for (or deadlocking on) the caller's pool
+        self._embedding_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pipeline-embed")
+
+    def run(self, texts: List[str], options: Optional[Dict[str, Any]] = None) -> Dict[str, List[Any]]:
+        """
+        Run all stages over a batch of texts
+
+        Args:
+            texts: Input texts
+            options: Text processing options for the preprocessing stage
+
+        Returns:
+            Dictionary with "preprocessing", "sentiment" and "embeddings" lists in input order
+        """
+        unique_texts = list(dict.fromkeys(texts))
+
+        # torch releases the GIL during the forward pass, so this runs alongside the loop below
+        embeddings_future = self._embedding_executor.submit(
+            self.embeddings_generator.generate_embeddings_batch, unique_texts
+        )
+
+        preprocessing = []
+        sentiment = []
+        for text in unique_texts:
+            preprocessing.append(self.text_processor.preprocess(text, options))
+            sentiment.append(self.sentiment_analyzer.analyze_sentiment(text))
+
+        embeddings = embeddings_future.result()
+
+        index = {text: i for i, text in enumerate(unique_texts)}
+        order = [index[text] for text in texts]
+        return {
+            "preprocessing": [preprocessing[i] for i in order],
+            "sentiment": [sentiment[i] for i in order],
+            "embeddings": [embeddings[i] for i in order],
+        }
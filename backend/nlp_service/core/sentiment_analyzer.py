@@ -4,10 +4,85 @@ Analyzes emotional tone, certainty, and civic engagement sentiment
 """
 
 import re
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Tuple, Any
 from dataclasses import dataclass
 from textblob import TextBlob
 import numpy as np
+import logging
+
+# Prefer VADER's lexicon scorer; TextBlob remains the fallback
+try:
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    _VADER = SentimentIntensityAnalyzer()
+    VADER_AVAILABLE = True
+except ImportError:
+    _VADER = None
+    VADER_AVAILABLE = False
+
+_WS_RE = re.compile(r'\s+')
+# Words of the lowercased text, without attached punctuation ("happy!" -> "happy")
+_WORD_RE = re.compile(r"[a-z']+")
+
+# Civic lexicons live at module level so analyzers stay cheap to pickle
+# for process-pool batch analysis
+
+# Civic engagement indicators
+CIVIC_POSITIVE_TERMS = frozenset({
+    'democracy', 'citizen', 'community', 'together', 'collaborate', 'participate',
+    'vote', 'engage', 'discuss', 'listen', 'understand', 'compromise', 'solution',
+    'progress', 'improve', 'build', 'develop', 'contribute', 'support', 'help',
+    'fair', 'justice', 'equal', 'rights', 'freedom', 'transparent', 'accountable'
+})
+
+CIVIC_NEGATIVE_TERMS = frozenset({
+    'corrupt', 'broken', 'fail', 'problem', 'crisis', 'disaster', 'terrible',
+    'awful', 'disgrace', 'shameful', 'outrageous', 'unacceptable', 'ridiculous'
+})
+
+# Certainty indicators
+CERTAINTY_HIGH = frozenset({
+    'definitely', 'absolutely', 'certainly', 'clearly', 'obviously', 'undoubtedly',
+    'without question', 'no doubt', 'sure', 'confident', 'positive', 'convinced',
+    'always', 'never', 'must', 'will', 'fact', 'truth', 'proven', 'established'
+})
+
+CERTAINTY_LOW = frozenset({
+    'maybe', 'perhaps', 'possibly', 'might', 'could', 'seems', 'appears',
+    'think', 'believe', 'suppose', 'guess', 'uncertain', 'unsure', 'doubt',
+    'probably', 'likely', 'tend to', 'may be', 'sort of', 'kind of'
+})
+
+# Constructiveness indicators
+CONSTRUCTIVE_TERMS = frozenset({
+    'solution', 'resolve', 'fix', 'improve', 'better', 'progress', 'develop',
+    'build', 'create', 'innovate', 'collaborate', 'cooperate', 'work together',
+    'compromise', 'find common ground', 'understand', 'learn', 'grow', 'move forward'
+})
+
+DESTRUCTIVE_TERMS = frozenset({
+    'destroy', 'ruin', 'damage', 'harm', 'attack', 'blame', 'fight', 'war',
+    'enemy', 'hate', 'stupid', 'idiot', 'moron', 'ridiculous', 'pathetic',
+    'waste', 'pointless', 'hopeless', 'impossible', 'never work'
+})
+
+# Emotional intensity markers
+HIGH_INTENSITY_MARKERS = frozenset({
+    'extremely', 'incredibly', 'absolutely', 'totally', 'completely', 'utterly',
+    'shocking', 'outrageous', 'amazing', 'terrible', 'wonderful', 'awful',
+    'fantastic', 'horrible', 'brilliant', 'disgusting', 'love', 'hate'
+})
+
+# Emotion keyword sets, matched against the token set
+EMOTION_KEYWORDS = {
+    "joy": frozenset(["happy", "joy", "excited", "pleased", "delighted", "cheerful"]),
+    "anger": frozenset(["angry", "mad", "furious", "outraged", "frustrated", "irritated"]),
+    "fear": frozenset(["afraid", "scared", "worried", "anxious", "concerned", "nervous"]),
+    "sadness": frozenset(["sad", "depressed", "disappointed", "upset", "unhappy"]),
+    "hope": frozenset(["hope", "optimistic", "confident", "hopeful", "positive"]),
+    "concern": frozenset(["concerned", "worried", "troubled", "bothered", "uneasy"])
+}
+
 
 @dataclass
 class SentimentScores:
@@ -24,54 +99,27 @@ class SentimentAnalyzer:
     Advanced sentiment analysis for civic discourse
     """
     
-    def __init__(self):
+    def __init__(self, use_textblob: bool = False):
         """Initialize sentiment analyzer with civic-specific lexicons"""
         
-        # Civic engagement indicators
-        self.civic_positive_terms = {
-            'democracy', 'citizen', 'community', 'together', 'collaborate', 'participate',
-            'vote', 'engage', 'discuss', 'listen', 'understand', 'compromise', 'solution',
-            'progress', 'improve', 'build', 'develop', 'contribute', 'support', 'help',
-            'fair', 'justice', 'equal', 'rights', 'freedom', 'transparent', 'accountable'
-        }
-        
-        self.civic_negative_terms = {
-            'corrupt', 'broken', 'fail', 'problem', 'crisis', 'disaster', 'terrible',
-            'awful', 'disgrace', 'shameful', 'outrageous', 'unacceptable', 'ridiculous'
-        }
-        
-        # Certainty indicators
-        self.certainty_high = {
-            'definitely', 'absolutely', 'certainly', 'clearly', 'obviously', 'undoubtedly',
-            'without question', 'no doubt', 'sure', 'confident', 'positive', 'convinced',
-            'always', 'never', 'must', 'will', 'fact', 'truth', 'proven', 'established'
-        }
-        
-        self.certainty_low = {
-            'maybe', 'perhaps', 'possibly', 'might', 'could', 'seems', 'appears',
-            'think', 'believe', 'suppose', 'guess', 'uncertain', 'unsure', 'doubt',
-            'probably', 'likely', 'tend to', 'may be', 'sort of', 'kind of'
-        }
-        
-        # Constructiveness indicators
-        self.constructive_terms = {
-            'solution', 'resolve', 'fix', 'improve', 'better', 'progress', 'develop',
-            'build', 'create', 'innovate', 'collaborate', 'cooperate', 'work together',
-            'compromise', 'find common ground', 'understand', 'learn', 'grow', 'move forward'
-        }
-        
-        self.destructive_terms = {
-            'destroy', 'ruin', 'damage', 'harm', 'attack', 'blame', 'fight', 'war',
-            'enemy', 'hate', 'stupid', 'idiot', 'moron', 'ridiculous', 'pathetic',
-            'waste', 'pointless', 'hopeless', 'impossible', 'never work'
-        }
-        
-        # Emotional intensity markers
-        self.high_intensity_markers = {
-            'extremely', 'incredibly', 'absolutely', 'totally', 'completely', 'utterly',
-            'shocking', 'outrageous', 'amazing', 'terrible', 'wonderful', 'awful',
-            'fantastic', 'horrible', 'brilliant', 'disgusting', 'love', 'hate'
-        }
+        # Polarity/subjectivity backend: VADER unless TextBlob is requested or VADER is missing
+        self.use_textblob = use_textblob or not VADER_AVAILABLE
+        if not use_textblob and not VADER_AVAILABLE:
+            logging.warning("vaderSentiment not available, using TextBlob for polarity")
+        
+        # Civic-specific lexicons (shared module-level frozensets)
+        self.civic_positive_terms = CIVIC_POSITIVE_TERMS
+        self.civic_negative_terms = CIVIC_NEGATIVE_TERMS
+        self.certainty_high = CERTAINTY_HIGH
+        self.certainty_low = CERTAINTY_LOW
+        self.constructive_terms = CONSTRUCTIVE_TERMS
+        self.destructive_terms = DESTRUCTIVE_TERMS
+        self.high_intensity_markers = HIGH_INTENSITY_MARKERS
+        self.emotion_keywords = EMOTION_KEYWORDS
+    
+    def __reduce__(self):
+        """Pickle by constructor args only; lexicons are rebound from the module"""
+        return (self.__class__, (self.use_textblob,))
     
     def analyze_sentiment(self, text: str) -> Dict[str, Any]:
         """
@@ -89,24 +137,27 @@ class SentimentAnalyzer:
         # Clean and prepare text
         clean_text = self._prepare_text(text)
         
-        # Basic sentiment using TextBlob
-        blob = TextBlob(clean_text)
+        # Tokenize once and share the token set across all lexicon checks
+        tokens = frozenset(_WORD_RE.findall(clean_text))
+        
+        # Basic polarity and subjectivity
+        polarity, subjectivity = self._score_polarity(clean_text)
         
         # Calculate various sentiment dimensions
         scores = SentimentScores(
-            polarity=blob.sentiment.polarity,
-            subjectivity=blob.sentiment.subjectivity,
-            certainty=self._analyze_certainty(clean_text),
-            civic_engagement=self._analyze_civic_engagement(clean_text),
-            emotional_intensity=self._analyze_emotional_intensity(clean_text),
-            constructiveness=self._analyze_constructiveness(clean_text)
+            polarity=polarity,
+            subjectivity=subjectivity,
+            certainty=self._analyze_certainty(tokens),
+            civic_engagement=self._analyze_civic_engagement(tokens),
+            emotional_intensity=self._analyze_emotional_intensity(clean_text, tokens),
+            constructiveness=self._analyze_constructiveness(tokens)
         )
         
         # Generate sentiment classification
         sentiment_class = self._classify_sentiment(scores)
         
         # Extract emotional indicators
-        emotions = self._extract_emotions(clean_text)
+        emotions = self._extract_emotions(tokens)
         
         # Calculate confidence scores
         confidence = self._calculate_confidence(clean_text, scores)
@@ -132,28 +183,46 @@ class SentimentAnalyzer:
             "word_count": len(clean_text.split())
         }
     
-    def analyze_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+    def analyze_batch(self, texts: List[str], n_workers: int = 1) -> List[Dict[str, Any]]:
         """
         Analyze sentiment for multiple texts
         
         Args:
             texts: List of texts to analyze
+            n_workers: Number of worker processes (1 runs in-process)
             
         Returns:
             List of sentiment analysis results
         """
-        return [self.analyze_sentiment(text) for text in texts]
+        # Analyze each distinct text once, then scatter results back in input order
+        unique_texts = list(dict.fromkeys(texts))
+        
+        if n_workers > 1 and len(unique_texts) > 1:
+            chunksize = max(1, len(unique_texts) // (n_workers * 4))
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                results = list(executor.map(self.analyze_sentiment, unique_texts, chunksize=chunksize))
+        else:
+            results = [self.analyze_sentiment(text) for text in unique_texts]
+        
+        by_text = dict(zip(unique_texts, results))
+        return [by_text[text] for text in texts]
+    
+    def _score_polarity(self, text: str) -> Tuple[float, float]:
+        """Return (polarity, subjectivity) from VADER, or TextBlob for parity"""
+        if self.use_textblob:
+            sentiment = TextBlob(text).sentiment
+            return sentiment.polarity, sentiment.subjectivity
+        
+        vs = _VADER.polarity_scores(text)
+        return vs['compound'], 1 - abs(vs['neu'])
     
     def _prepare_text(self, text: str) -> str:
         """Prepare text for analysis"""
         # Basic cleaning while preserving sentiment markers
-        cleaned = re.sub(r'\s+', ' ', text.strip())
-        return cleaned.lower()
+        return _WS_RE.sub(' ', text.strip()).lower()
     
-    def _analyze_certainty(self, text: str) -> float:
-        """Analyze certainty level in text"""
-        words = set(text.split())
-        
+    def _analyze_certainty(self, words: frozenset) -> float:
+        """Analyze certainty level from the text's token set"""
         high_certainty_count = len(words.intersection(self.certainty_high))
         low_certainty_count = len(words.intersection(self.certainty_low))
         
@@ -164,10 +233,8 @@ class SentimentAnalyzer:
         certainty_ratio = high_certainty_count / (high_certainty_count + low_certainty_count + 1)
         return min(1.0, max(0.0, certainty_ratio))
     
-    def _analyze_civic_engagement(self, text: str) -> float:
-        """Analyze civic engagement level"""
-        words = set(text.split())
-        
+    def _analyze_civic_engagement(self, words: frozenset) -> float:
+        """Analyze civic engagement level from the text's token set"""
         positive_civic = len(words.intersection(self.civic_positive_terms))
         negative_civic = len(words.intersection(self.civic_negative_terms))
         
@@ -179,10 +246,8 @@ class SentimentAnalyzer:
         engagement_score = (positive_civic + 0.3 * negative_civic) / (len(words) / 10)
         return min(1.0, max(0.0, engagement_score))
     
-    def _analyze_emotional_intensity(self, text: str) -> float:
+    def _analyze_emotional_intensity(self, text: str, words: frozenset) -> float:
         """Analyze emotional intensity"""
-        words = set(text.split())
-        
         intensity_markers = len(words.intersection(self.high_intensity_markers))
         
         # Check for caps (emotional indicator)
@@ -200,10 +265,8 @@ class SentimentAnalyzer:
         
         return min(1.0, max(0.0, intensity_score))
     
-    def _analyze_constructiveness(self, text: str) -> float:
-        """Analyze constructiveness of the discourse"""
-        words = set(text.split())
-        
+    def _analyze_constructiveness(self, words: frozenset) -> float:
+        """Analyze constructiveness from the text's token set"""
         constructive_count = len(words.intersection(self.constructive_terms))
         destructive_count = len(words.intersection(self.destructive_terms))
         
@@ -257,26 +320,12 @@ class SentimentAnalyzer:
         else:
             return "highly_uncertain"
     
-    def _extract_emotions(self, text: str) -> List[str]:
-        """Extract emotional indicators from text"""
-        emotions = []
-        
-        # Simple emotion detection based on keywords
-        emotion_keywords = {
-            "joy": ["happy", "joy", "excited", "pleased", "delighted", "cheerful"],
-            "anger": ["angry", "mad", "furious", "outraged", "frustrated", "irritated"],
-            "fear": ["afraid", "scared", "worried", "anxious", "concerned", "nervous"],
-            "sadness": ["sad", "depressed", "disappointed", "upset", "unhappy"],
-            "hope": ["hope", "optimistic", "confident", "hopeful", "positive"],
-            "concern": ["concerned", "worried", "troubled", "bothered", "uneasy"]
-        }
-        
-        words = text.split()
-        for emotion, keywords in emotion_keywords.items():
-            if any(keyword in text for keyword in keywords):
-                emotions.append(emotion)
-        
-        return emotions
+    def _extract_emotions(self, words: frozenset) -> List[str]:
+        """Extract emotional indicators from the text's token set"""
+        return [
+            emotion for emotion, keywords in self.emotion_keywords.items()
+            if not words.isdisjoint(keywords)
+        ]
     
     def _calculate_confidence(self, text: str, scores: SentimentScores) -> float:
         """Calculate confidence in sentiment analysis"""
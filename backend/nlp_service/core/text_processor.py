@@ -5,30 +5,167 @@ Handles tokenization, cleaning, normalization, and preprocessing of text data
 
 import re
 import string
+import sys
+import copy
+import functools
+from functools import cached_property
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import unicodedata
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Iterator
+from dataclasses import dataclass, fields, replace
 import nltk
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize, sent_tokenize, wordpunct_tokenize
+from nltk.tokenize import NLTKWordTokenizer, wordpunct_tokenize
 from nltk.stem import PorterStemmer, WordNetLemmatizer
-import spacy
 
-# Download required NLTK data on first import
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+# NLTK corpora/models needed by the tokenize, stopword and lemmatize paths
+_NLTK_RESOURCES = (
+    ('tokenizers/punkt', 'punkt'),
+    ('corpora/stopwords', 'stopwords'),
+    ('corpora/wordnet', 'wordnet'),
+)
+_nltk_data_ready = False
+
+def ensure_nltk_data():
+    """Download required NLTK data if missing (once per process, on first use)"""
+    global _nltk_data_ready
+    if _nltk_data_ready:
+        return
     
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+    for resource_path, package in _NLTK_RESOURCES:
+        try:
+            nltk.data.find(resource_path)
+        except LookupError:
+            nltk.download(package)
+    _nltk_data_ready = True
+
+# Word tokenizer built once; it needs no NLTK data
+_WORD_TOKENIZER = NLTKWordTokenizer()
+
+@functools.lru_cache(maxsize=None)
+def _sentence_tokenizer():
+    """
+    Punkt sentence tokenizer, loaded on first use and reused; nltk.word_tokenize/
+    sent_tokenize reload Punkt on every call in newer NLTK releases
+    """
+    ensure_nltk_data()
+    try:
+        from nltk.tokenize import PunktTokenizer  # NLTK >= 3.8.2
+    except ImportError:
+        return nltk.data.load('tokenizers/punkt/english.pickle')
     
+    try:
+        nltk.data.find('tokenizers/punkt_tab')
+    except LookupError:
+        nltk.download('punkt_tab')
+    return PunktTokenizer("english")
+
+# xxhash keys the preprocess cache faster than hash() on long documents
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# Use RE2's linear-time engine for the URL and fused cleanup patterns when installed
 try:
-    nltk.data.find('corpora/wordnet')
-except LookupError:
-    nltk.download('wordnet')
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+def _compile_linear(pattern: str, flags: int = 0):
+    """Compile with RE2 if available, falling back to the stdlib engine"""
+    if RE2_AVAILABLE:
+        try:
+            # RE2's \b and \s are ASCII-only already, matching re.ASCII
+            return re2.compile(pattern)
+        except Exception:
+            pass
+    return re.compile(pattern, flags)
+
+# Patterns and tables used on every document, built once at import
+_HTML_RE = re.compile(r'<[^>]+>')
+# Single character class; matches the same set as the old alternation
+# ([a-zA-Z]|[0-9]|[$-_@.&+]|[!*\(\),]|%XX), whose $-_ range spans '/', ':', '?', '='
+_URL_RE = _compile_linear(r"https?://[A-Za-z0-9!$%&'()*+,\-./:;<=>?@\[\\\]^_]+")
+# Email addresses are ASCII by construction, so \b needs no Unicode tables
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', re.ASCII)
+_WS_RE = re.compile(r'\s+')
+# Byte-table whitespace class, only valid for text that is pure ASCII
+_ASCII_WS_RE = re.compile(r'\s+', re.ASCII)
+_PUNCT_TABLE = str.maketrans('', '', string.punctuation)
+_DIGIT_TABLE = str.maketrans('', '', string.digits)
+_DIGIT_PUNCT_TABLE = str.maketrans('', '', string.punctuation + string.digits)
+
+_CLEAN_PATTERNS = (('html', _HTML_RE), ('url', _URL_RE), ('email', _EMAIL_RE))
+
+@functools.lru_cache(maxsize=None)
+def _clean_regex(remove_html: bool, remove_urls: bool, remove_emails: bool):
+    """
+    HTML, URL and email removal fused into one alternation for a single pass,
+    compiled once per combination of the three flags (None when all are off)
+    """
+    enabled = [
+        f'(?P<{name}>{pattern.pattern})'
+        for (name, pattern), flag in zip(_CLEAN_PATTERNS, (remove_html, remove_urls, remove_emails))
+        if flag
+    ]
+    return _compile_linear('|'.join(enabled), re.ASCII) if enabled else None
+
+_CLEAN_RE = _clean_regex(True, True, True)
+
+# Common civic discourse terms to preserve
+CIVIC_TERMS = frozenset(sys.intern(term.casefold()) for term in {
+    'democracy', 'voting', 'citizen', 'government', 'policy', 'legislation',
+    'representative', 'senator', 'congressman', 'mayor', 'governor', 'president',
+    'constitution', 'amendment', 'bill', 'law', 'regulation', 'ordinance',
+    'budget', 'tax', 'public', 'community', 'municipal', 'federal', 'state',
+    'civic', 'political', 'election', 'campaign', 'ballot', 'referendum'
+})
+
+# Batches smaller than this are processed in-process; pool start-up would dominate
+PARALLEL_BATCH_THRESHOLD = 256
+
+# Per-process TextProcessor used by preprocess_batch workers
+_worker_processor = None
+
+def _init_batch_worker():
+    """Build one TextProcessor per worker process (models are not picklable)"""
+    global _worker_processor
+    _worker_processor = TextProcessor()
+
+def _preprocess_in_worker(text: str, options) -> Dict[str, Any]:
+    """Module-level (picklable) entry point for preprocess_batch workers"""
+    return _worker_processor.preprocess(text, options)
+
+# Worker pool shared by all preprocess_batch calls; spawning processes and
+# loading NLTK per call would eat most of the parallel speedup
+_batch_pool: Optional[ProcessPoolExecutor] = None
+_batch_pool_size = 0
+_batch_pool_lock = threading.Lock()
+
+def _get_batch_pool(n_process: int) -> ProcessPoolExecutor:
+    """Return the shared worker pool, (re)creating it for a different size"""
+    global _batch_pool, _batch_pool_size
+    with _batch_pool_lock:
+        if _batch_pool is None or _batch_pool_size != n_process:
+            if _batch_pool is not None:
+                _batch_pool.shutdown(wait=False)
+            _batch_pool = ProcessPoolExecutor(max_workers=n_process, initializer=_init_batch_worker)
+            _batch_pool_size = n_process
+        return _batch_pool
+
+def _discard_batch_pool(pool: ProcessPoolExecutor):
+    """Forget a pool whose workers died so the next batch starts a fresh one"""
+    global _batch_pool
+    with _batch_pool_lock:
+        if _batch_pool is pool:
+            _batch_pool = None
 
 @dataclass
 class ProcessingOptions:
@@ -48,45 +185,93 @@ class ProcessingOptions:
     max_word_length: int = 50
     preserve_sentence_structure: bool = False
 
+_DEFAULT_OPTS = ProcessingOptions()
+_OPT_FIELD_NAMES = tuple(f.name for f in fields(ProcessingOptions))
+_OPT_FIELDS = frozenset(_OPT_FIELD_NAMES)
+
+# Number of preprocess() results memoized per TextProcessor
+PREPROCESS_CACHE_SIZE = 4096
+
+def _collapse_whitespace(text: str) -> str:
+    """Collapse whitespace runs to single spaces, using the ASCII regex when possible"""
+    return (_ASCII_WS_RE if text.isascii() else _WS_RE).sub(' ', text)
+
+def _casefold_key(token: str) -> str:
+    """Lexicon lookup key: casefold, skipped for tokens that are already ASCII lowercase"""
+    return token if token.isascii() and token.islower() else token.casefold()
+
+def _parse_opts(options) -> ProcessingOptions:
+    """Build ProcessingOptions from a dict of overrides (unknown keys are ignored)"""
+    if not options:
+        return ProcessingOptions()
+    if not isinstance(options, dict):
+        # Already a ProcessingOptions object
+        return options
+    return replace(_DEFAULT_OPTS, **{k: v for k, v in options.items() if k in _OPT_FIELDS})
+
 class TextProcessor:
     """
     Comprehensive text processing pipeline for civic discourse analysis
     """
     
     def __init__(self):
-        """Initialize the text processor with required models"""
-        self.stemmer = PorterStemmer()
-        self.lemmatizer = WordNetLemmatizer()
+        """Initialize the text processor; NLTK and spaCy models load on first use"""
+        # Common civic discourse terms to preserve
+        self.civic_terms = CIVIC_TERMS
         
-        # Try to load spaCy model, fallback if not available
+        # LRU of preprocess() results keyed by (content hash, length, options)
+        self._preprocess_cache = OrderedDict()
+        self._preprocess_cache_lock = threading.Lock()
+    
+    @cached_property
+    def stemmer(self) -> PorterStemmer:
+        """Porter stemmer, built on first use"""
+        return PorterStemmer()
+    
+    @cached_property
+    def lemmatizer(self) -> WordNetLemmatizer:
+        """WordNet lemmatizer, built on first use"""
+        ensure_nltk_data()
+        return WordNetLemmatizer()
+    
+    @cached_property
+    def _stem_cached(self):
+        """Memoized stem(); token frequencies are Zipfian"""
+        return functools.lru_cache(maxsize=50000)(self.stemmer.stem)
+    
+    @cached_property
+    def _lemmatize_cached(self):
+        """Memoized lemmatize()"""
+        return functools.lru_cache(maxsize=50000)(self.lemmatizer.lemmatize)
+    
+    @cached_property
+    def nlp(self):
+        """spaCy English pipeline, or None if the model is not installed"""
+        import spacy
         try:
-            self.nlp = spacy.load("en_core_web_sm")
+            return spacy.load("en_core_web_sm")
         except OSError:
             print("Warning: spaCy English model not found. Some features may be limited.")
-            self.nlp = None
-            
-        # Common civic discourse terms to preserve
-        self.civic_terms = {
-            'democracy', 'voting', 'citizen', 'government', 'policy', 'legislation',
-            'representative', 'senator', 'congressman', 'mayor', 'governor', 'president',
-            'constitution', 'amendment', 'bill', 'law', 'regulation', 'ordinance',
-            'budget', 'tax', 'public', 'community', 'municipal', 'federal', 'state',
-            'civic', 'political', 'election', 'campaign', 'ballot', 'referendum'
-        }
-        
-        # Load English stopwords
+            return None
+    
+    @cached_property
+    def stop_words(self) -> frozenset:
+        """English stopwords, casefolded and interned"""
+        ensure_nltk_data()
         try:
-            self.stop_words = set(stopwords.words('english'))
+            return frozenset(sys.intern(word.casefold()) for word in stopwords.words('english'))
         except LookupError:
-            self.stop_words = set()
+            return frozenset()
     
-    def preprocess(self, text: str, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def preprocess(self, text: str, options: Optional[Dict[str, Any]] = None, metadata_only: bool = False) -> Dict[str, Any]:
         """
         Main preprocessing pipeline that applies all cleaning and normalization steps
         
         Args:
             text: Input text to process
             options: Processing configuration options
+            metadata_only: Skip building processed_text/cleaned_text (returned empty);
+                tokens and metadata, including final_length, are still computed
             
         Returns:
             Dictionary containing processed text, tokens, and metadata
@@ -100,16 +285,34 @@ class TextProcessor:
             }
         
         # Parse options
-        opts = ProcessingOptions()
-        if options:
-            if isinstance(options, dict):
-                for key, value in options.items():
-                    if hasattr(opts, key):
-                        setattr(opts, key, value)
-            else:
-                # If options is already a ProcessingOptions object
-                opts = options
-        
+        opts = _parse_opts(options)
+        
+        # Duplicate documents (reposts, templated answers) are served from the cache;
+        # copies keep callers from mutating the cached result
+        key = (self._cache_key(text, opts), metadata_only)
+        with self._preprocess_cache_lock:
+            cached = self._preprocess_cache.get(key)
+            if cached is not None:
+                self._preprocess_cache.move_to_end(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
+        result = self._preprocess_uncached(text, opts, metadata_only)
+        
+        with self._preprocess_cache_lock:
+            self._preprocess_cache[key] = copy.deepcopy(result)
+            if len(self._preprocess_cache) > PREPROCESS_CACHE_SIZE:
+                self._preprocess_cache.popitem(last=False)
+        
+        return result
+    
+    def _cache_key(self, text: str, opts: ProcessingOptions) -> tuple:
+        """Hashable preprocess cache key for a text and its options"""
+        digest = xxhash.xxh64_intdigest(text) if XXHASH_AVAILABLE else hash(text)
+        return (digest, len(text), tuple(getattr(opts, name) for name in _OPT_FIELD_NAMES))
+    
+    def _preprocess_uncached(self, text: str, opts: ProcessingOptions, metadata_only: bool = False) -> Dict[str, Any]:
+        """Run the full preprocessing pipeline for one text"""
         # Track processing steps
         metadata = {
             "original_length": len(text),
@@ -126,56 +329,68 @@ class TextProcessor:
             processed_text = self._normalize_unicode(processed_text)
             metadata["processing_steps"].append("unicode_normalization")
         
-        # Step 3: Remove HTML tags
+        # Steps 3-4: Remove HTML tags, URLs and emails
+        processed_text = self._clean_all(processed_text, opts)
         if opts.remove_html:
-            processed_text = self._remove_html(processed_text)
             metadata["processing_steps"].append("html_removal")
-        
-        # Step 4: Remove URLs and emails
         if opts.remove_urls:
-            processed_text = self._remove_urls(processed_text)
             metadata["processing_steps"].append("url_removal")
-            
         if opts.remove_emails:
-            processed_text = self._remove_emails(processed_text)
             metadata["processing_steps"].append("email_removal")
         
         # Step 5: Tokenization
         tokens = self.tokenize(processed_text, "words")
         
-        # Step 6: Advanced token processing
-        if opts.remove_stopwords or opts.stem_words or opts.lemmatize_words:
-            tokens = self._process_tokens(tokens, opts, metadata)
+        # Lowercase all tokens in one pass rather than token by token. This happens after
+        # tokenizing because the Punkt sentence splitter is case-sensitive; tokens never
+        # contain whitespace, so the join/split round trip keeps the token boundaries.
+        process_tokens = opts.remove_stopwords or opts.stem_words or opts.lemmatize_words
+        lowercased = process_tokens and opts.lowercase
+        if lowercased and tokens:
+            tokens = " ".join(tokens).lower().split(" ")
+        
+        # Steps 6-7: Token processing and length filtering, streamed through one
+        # generator and materialized once
+        length_filter = opts.min_word_length > 1 or opts.max_word_length < 50
+        stats = {"length_filtered": 0}
+        tokens = list(self._iter_processed(tokens, opts, lowercased, process_tokens, length_filter, stats))
+        
+        if process_tokens:
             metadata["processing_steps"].append("token_processing")
-        
-        # Step 7: Filter tokens by length
-        if opts.min_word_length > 1 or opts.max_word_length < 50:
-            original_count = len(tokens)
-            tokens = [
-                token for token in tokens 
-                if opts.min_word_length <= len(token) <= opts.max_word_length
-            ]
-            metadata["tokens_filtered"] = original_count - len(tokens)
+        if length_filter:
+            metadata["tokens_filtered"] = stats["length_filtered"]
             metadata["processing_steps"].append("length_filtering")
         
         # Step 8: Detect civic terms
-        civic_terms_found = [token.lower() for token in tokens if token.lower() in self.civic_terms]
-        metadata["civic_terms_found"] = list(set(civic_terms_found))
+        # dict.fromkeys dedups in first-seen order, keeping results reproducible
+        civic_terms = self.civic_terms
+        keys = tokens if lowercased else map(_casefold_key, tokens)
+        metadata["civic_terms_found"] = list(dict.fromkeys(key for key in keys if key in civic_terms))
         
         # Step 9: Reconstruct text or keep tokens
-        if opts.preserve_sentence_structure:
+        if metadata_only:
+            # Length of the single-space join, without building it
+            final_text = cleaned_text = ""
+            final_length = max(sum(map(len, tokens)) + len(tokens) - 1, 0)
+        elif opts.preserve_sentence_structure:
             final_text = self._reconstruct_sentences(tokens)
+            # Reconstruction may introduce irregular spacing
+            needs_ws_collapse = True
         else:
+            # Tokens never contain whitespace, so the join is already single-spaced
             final_text = " ".join(tokens)
+            needs_ws_collapse = False
         
-        # Final cleaning
-        cleaned_text = self._final_clean(final_text, opts)
+        if not metadata_only:
+            # Final cleaning
+            cleaned_text = self._final_clean(final_text, opts) if needs_ws_collapse else final_text
+            final_length = len(cleaned_text)
         
         # Update metadata
         metadata.update({
-            "final_length": len(cleaned_text),
+            "final_length": final_length,
             "token_count": len(tokens),
-            "compression_ratio": len(cleaned_text) / len(text) if len(text) > 0 else 0,
+            "compression_ratio": final_length / len(text) if len(text) > 0 else 0,
             "processing_complete": True
         })
         
@@ -186,6 +401,40 @@ class TextProcessor:
             "metadata": metadata
         }
     
+    def preprocess_batch(self, texts: List[str], options: Optional[Dict[str, Any]] = None, n_process: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Preprocess many texts, fanning out to worker processes for large batches
+        
+        Args:
+            texts: Input texts to process
+            options: Processing configuration options (shared by all texts)
+            n_process: Number of worker processes (defaults to the CPU count)
+            
+        Returns:
+            List of preprocess() results in input order
+        """
+        n_process = n_process or os.cpu_count() or 1
+        if n_process <= 1 or len(texts) < PARALLEL_BATCH_THRESHOLD:
+            return [self.preprocess(text, options) for text in texts]
+        
+        # Workers don't share this process's cache, so send each distinct text once
+        unique_texts = list(dict.fromkeys(texts))
+        
+        # preprocess() never calls spaCy, so nlp.pipe has nothing to batch here;
+        # parallelism comes from one TextProcessor per worker process instead
+        chunksize = max(1, len(unique_texts) // (n_process * 4))
+        pool = _get_batch_pool(n_process)
+        try:
+            results = list(pool.map(
+                _preprocess_in_worker, unique_texts, [options] * len(unique_texts), chunksize=chunksize
+            ))
+        except BrokenProcessPool:
+            _discard_batch_pool(pool)
+            return [self.preprocess(text, options) for text in texts]
+        
+        by_text = dict(zip(unique_texts, results))
+        return [copy.deepcopy(by_text[text]) for text in texts]
+    
     def tokenize(self, text: str, tokenize_by: str = "words") -> List[str]:
         """
         Tokenize text by different units
@@ -201,16 +450,25 @@ class TextProcessor:
             return []
         
         if tokenize_by == "words":
-            return word_tokenize(text)
+            return self._word_tokenize(text)
         elif tokenize_by == "sentences":
-            return sent_tokenize(text)
+            return _sentence_tokenizer().tokenize(text)
         elif tokenize_by == "paragraphs":
             return [p.strip() for p in text.split('\n\n') if p.strip()]
         elif tokenize_by == "wordpunct":
             return wordpunct_tokenize(text)
         else:
             # Default to word tokenization
-            return word_tokenize(text)
+            return self._word_tokenize(text)
+    
+    def _word_tokenize(self, text: str) -> List[str]:
+        """Equivalent of nltk.word_tokenize using the module-level tokenizers"""
+        word_tokenize = _WORD_TOKENIZER.tokenize
+        return [
+            token
+            for sentence in _sentence_tokenizer().tokenize(text)
+            for token in word_tokenize(sentence)
+        ]
     
     def clean_text(self, text: str, options: Optional[Dict[str, Any]] = None) -> str:
         """
@@ -226,34 +484,22 @@ class TextProcessor:
         if not text:
             return ""
         
-        opts = ProcessingOptions()
-        if options:
-            if isinstance(options, dict):
-                for key, value in options.items():
-                    if hasattr(opts, key):
-                        setattr(opts, key, value)
-            else:
-                opts = options
-        
-        cleaned = text
+        opts = _parse_opts(options)
         
-        if opts.remove_html:
-            cleaned = self._remove_html(cleaned)
-        
-        if opts.remove_urls:
-            cleaned = self._remove_urls(cleaned)
-        
-        if opts.remove_emails:
-            cleaned = self._remove_emails(cleaned)
+        cleaned = self._clean_all(text, opts)
         
         if opts.remove_extra_whitespace:
-            cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+            cleaned = _collapse_whitespace(cleaned).strip()
         
         if opts.lowercase:
             cleaned = cleaned.lower()
         
+        # Digits and punctuation go in a single translate when both are removed
         if opts.remove_punctuation:
-            cleaned = cleaned.translate(str.maketrans('', '', string.punctuation))
+            table = _DIGIT_PUNCT_TABLE if opts.remove_numbers else _PUNCT_TABLE
+            cleaned = cleaned.translate(table)
+        elif opts.remove_numbers:
+            cleaned = cleaned.translate(_DIGIT_TABLE)
         
         return cleaned
     
@@ -270,14 +516,16 @@ class TextProcessor:
         if not text:
             return ""
         
-        # Unicode normalization
-        normalized = unicodedata.normalize('NFKD', text)
-        
-        # Convert to ASCII, removing accents
-        normalized = normalized.encode('ascii', 'ignore').decode('ascii')
+        # Unicode normalization and ASCII conversion (removing accents);
+        # both are no-ops for pure ASCII input
+        if text.isascii():
+            normalized = text
+        else:
+            normalized = unicodedata.normalize('NFKD', text)
+            normalized = normalized.encode('ascii', 'ignore').decode('ascii')
         
         # Basic cleaning
-        normalized = re.sub(r'\s+', ' ', normalized).strip()
+        normalized = _collapse_whitespace(normalized).strip()
         
         return normalized
     
@@ -286,69 +534,109 @@ class TextProcessor:
         cleaned = text.strip()
         
         if opts.remove_extra_whitespace:
-            cleaned = re.sub(r'\s+', ' ', cleaned)
+            cleaned = _collapse_whitespace(cleaned)
             metadata["processing_steps"].append("whitespace_normalization")
         
         return cleaned
     
     def _normalize_unicode(self, text: str) -> str:
-        """Normalize unicode characters"""
-        return unicodedata.normalize('NFKD', text)
+        """Normalize unicode characters (NFKD is a no-op for ASCII)"""
+        return text if text.isascii() else unicodedata.normalize('NFKD', text)
+    
+    def _clean_all(self, text: str, opts: ProcessingOptions) -> str:
+        """Remove HTML, URLs and emails in one pass over whichever of the three are enabled"""
+        regex = _clean_regex(opts.remove_html, opts.remove_urls, opts.remove_emails)
+        return regex.sub('', text) if regex is not None else text
     
     def _remove_html(self, text: str) -> str:
         """Remove HTML tags"""
-        html_pattern = re.compile(r'<[^>]+>')
-        return html_pattern.sub('', text)
+        return _HTML_RE.sub('', text)
     
     def _remove_urls(self, text: str) -> str:
         """Remove URLs from text"""
-        url_pattern = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
-        return url_pattern.sub('', text)
+        return _URL_RE.sub('', text)
     
     def _remove_emails(self, text: str) -> str:
         """Remove email addresses"""
-        email_pattern = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
-        return email_pattern.sub('', text)
+        return _EMAIL_RE.sub('', text)
+    
+    def _process_tokens(self, tokens: List[str], opts: ProcessingOptions, metadata: Dict, lowercased: bool = False) -> List[str]:
+        """Process individual tokens based on options (lowercased: text was already lowercased)"""
+        return list(self._iter_processed(tokens, opts, lowercased))
+    
+    def _iter_processed(self, tokens: List[str], opts: ProcessingOptions, lowercased: bool = False,
+                        process_tokens: bool = True, length_filter: bool = False,
+                        stats: Optional[Dict[str, int]] = None) -> Iterator[str]:
+        """
+        Yield tokens after filtering, stemming/lemmatization and (optionally) the
+        length filter, without building a list per stage
+        
+        Args:
+            tokens: Tokenizer output
+            opts: Processing options
+            lowercased: Whether the text was already lowercased upstream
+            process_tokens: Apply the filter/stem/lemmatize stage
+            length_filter: Drop tokens outside [min_word_length, max_word_length]
+            stats: If given, receives the number of length-filtered tokens
+        """
+        stream = self._iter_filtered(tokens, opts, lowercased) if process_tokens else tokens
+        
+        stem = self._stem_cached if process_tokens and opts.stem_words else None
+        lemmatize = self._lemmatize_cached if process_tokens and opts.lemmatize_words else None
+        min_length, max_length = opts.min_word_length, opts.max_word_length
+        dropped = 0
+        
+        for token in stream:
+            # Stem words if requested
+            if stem is not None:
+                token = stem(token)
+            
+            # Lemmatize words if requested
+            if lemmatize is not None:
+                token = lemmatize(token)
+            
+            if length_filter and not min_length <= len(token) <= max_length:
+                dropped += 1
+                continue
+            
+            yield token
+        
+        if stats is not None:
+            stats["length_filtered"] = dropped
     
-    def _process_tokens(self, tokens: List[str], opts: ProcessingOptions, metadata: Dict) -> List[str]:
-        """Process individual tokens based on options"""
-        processed_tokens = []
+    def _iter_filtered(self, tokens: List[str], opts: ProcessingOptions, lowercased: bool = False) -> Iterator[str]:
+        """Lowercase, strip punctuation and drop digit/stopword tokens in one loop"""
+        # Hoist option flags and lookups out of the per-token loop
+        lowercase = opts.lowercase and not lowercased
+        strip_punctuation = opts.remove_punctuation
+        drop_numbers = opts.remove_numbers
+        stop_words = self.stop_words if opts.remove_stopwords else None
+        civic_terms = self.civic_terms
+        punct_table = _PUNCT_TABLE
         
         for token in tokens:
             # Skip empty tokens
             if not token.strip():
                 continue
             
-            # Convert to lowercase if requested
-            if opts.lowercase:
+            if lowercase:
                 token = token.lower()
             
-            # Remove punctuation if requested
-            if opts.remove_punctuation:
-                token = token.translate(str.maketrans('', '', string.punctuation))
+            if strip_punctuation:
+                token = token.translate(punct_table)
                 if not token:  # Skip if token becomes empty
                     continue
             
-            # Remove numbers if requested
-            if opts.remove_numbers and token.isdigit():
+            if drop_numbers and token.isdigit():
                 continue
             
             # Remove stopwords if requested (but preserve civic terms)
-            if opts.remove_stopwords and token.lower() in self.stop_words:
-                if token.lower() not in self.civic_terms:
+            if stop_words is not None:
+                key = _casefold_key(token)
+                if key in stop_words and key not in civic_terms:
                     continue
             
-            # Stem words if requested
-            if opts.stem_words:
-                token = self.stemmer.stem(token)
-            
-            # Lemmatize words if requested
-            if opts.lemmatize_words:
-                token = self.lemmatizer.lemmatize(token)
-            
-            processed_tokens.append(token)
-        
-        return processed_tokens
+            yield token
     
     def _reconstruct_sentences(self, tokens: List[str]) -> str:
         """Reconstruct sentences maintaining structure"""
@@ -358,6 +646,6 @@ class TextProcessor:
     def _final_clean(self, text: str, opts: ProcessingOptions) -> str:
         """Final cleaning operations"""
         if opts.remove_extra_whitespace:
-            text = re.sub(r'\s+', ' ', text).strip()
+            text = _collapse_whitespace(text).strip()
         
         return text 
\ No newline at end of file
@@ -3,17 +3,37 @@ NLP Service - Text Processing and Analysis
 Main FastAPI application for natural language processing tasks
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, Response, StreamingResponse
 import uvicorn
+import logging
 import os
+import time
+import json
+import base64
+import asyncio
+import functools
+import ipaddress
 import numpy as np
-from typing import List, Optional, Dict, Any
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Optional, Dict, Any, Callable
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 from core.text_processor import TextProcessor
 from core.sentiment_analyzer import SentimentAnalyzer
 from core.embeddings_generator import EmbeddingsGenerator, EmbeddingConfig
 from core.clustering_engine import ClusteringEngine, ClusterConfig
+from core.dynamic_batcher import DynamicBatcher
+from core.pipeline import NLPPipeline
 from models.schemas import (
     TextProcessingRequest,
     TextProcessingResponse,
@@ -32,16 +52,57 @@ from models.schemas import (
     SimilarTextSearchRequest,
     SimilarTextSearchResponse,
     ClusteringRequest,
-    ClusteringResponse
+    ClusteringResponse,
+    MAX_TEXT_LENGTH
 )
 
 # Initialize FastAPI app
+# orjson encodes the float-heavy payloads (scores, centroids) several times faster
+RESPONSE_CLASS = ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
+
+def _warmup_models():
+    """Exercise every processor once so the first request doesn't pay for lazy loading"""
+    embeddings_generator.warmup()
+    sentiment_analyzer.analyze_sentiment("warmup")
+    text_processor.preprocess("warmup")
+    
+    rng = np.random.default_rng(0)
+    clustering_engine.cluster_responses(
+        [f"warmup {i}" for i in range(4)], list(rng.random((4, 8), dtype=np.float32)), ClusterConfig(n_clusters=2)
+    )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup
+    try:
+        await _run_blocking(_warmup_models)
+    except Exception as e:
+        logging.warning(f"Model warmup failed: {e}")
+    
+    # FastAPI keeps the generated document on app.openapi_schema, so building it
+    # here means no request (docs or /openapi.json) pays for schema generation
+    try:
+        app.openapi()
+    except Exception as e:
+        logging.warning(f"OpenAPI schema generation failed: {e}")
+    
+    yield
+    
+    # Shutdown
+    await embedding_batcher.close()
+    await sentiment_batcher.close()
+    EXECUTOR.shutdown(wait=False)
+    for name in list(_shm_blocks):
+        _release_shm(name)
+
 app = FastAPI(
     title="Civic Sense-Making NLP Service",
     description="Natural Language Processing service for text analysis and processing",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan,
+    default_response_class=RESPONSE_CLASS
 )
 
 # Add CORS middleware
@@ -51,13 +112,131 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Processing-Time"],
 )
 
+@app.middleware("http")
+async def add_processing_time_header(request: Request, call_next):
+    """Report server-side handling time (seconds) on every response"""
+    start = time.perf_counter_ns()
+    response = await call_next(request)
+    # For streamed responses this is the time until the first byte
+    response.headers["X-Processing-Time"] = f"{(time.perf_counter_ns() - start) / 1e9:.4f}"
+    return response
+
 # Initialize processors
 text_processor = TextProcessor()
 sentiment_analyzer = SentimentAnalyzer()
 embeddings_generator = EmbeddingsGenerator()
 clustering_engine = ClusteringEngine()
+nlp_pipeline = NLPPipeline(text_processor, sentiment_analyzer, embeddings_generator)
+
+# The embedding backend is chosen once at startup, so responses reuse it
+MODEL_TYPE = embeddings_generator.get_embedding_info()["model_type"]
+
+# CPU-bound model work runs on this pool so the event loop keeps serving requests
+# (torch, numpy and the regex engine release the GIL for most of their work)
+EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+# Concurrent single-text requests are coalesced into one batched forward pass
+embedding_batcher = DynamicBatcher(embeddings_generator.generate_embeddings_batch, executor=EXECUTOR)
+sentiment_batcher = DynamicBatcher(sentiment_analyzer.analyze_batch, executor=EXECUTOR)
+
+async def _run_blocking(fn, *args, **kwargs):
+    """Run a blocking call on EXECUTOR and await its result"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(EXECUTOR, functools.partial(fn, *args, **kwargs))
+
+# Per-text limit for list inputs, matching TextField on the single-text request models
+MAX_TEXT_CHARS = MAX_TEXT_LENGTH
+
+def _validate_texts(texts: List[str]):
+    """
+    Reject oversized texts before any model work starts
+    
+    Raises:
+        HTTPException: 413 naming the first text over MAX_TEXT_CHARS
+    """
+    for i, text in enumerate(texts):
+        if len(text) > MAX_TEXT_CHARS:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Text at index {i} is {len(text)} characters; the limit is {MAX_TEXT_CHARS}"
+            )
+
+# Embedding transport formats: base64 float16 bytes (default), base64 int8 with a per-vector
+# scale (v ~= q * scale), or a plain float list for legacy clients
+EMBEDDING_FORMATS = ("fp16_b64", "int8_b64", "fp32_list")
+EMBEDDING_FORMAT_PATTERN = f"^({'|'.join(EMBEDDING_FORMATS)})$"
+
+def _encode_embedding(embedding: np.ndarray, fmt: str) -> Dict[str, Any]:
+    """Serialize an embedding into EmbeddingResponse fields for the requested format"""
+    if fmt == "fp32_list":
+        return {"embedding": embedding.astype(np.float32).tolist(), "dtype": "float32"}
+    if fmt == "int8_b64":
+        # Symmetric quantization: cosine similarity is unaffected by the scale
+        vector = embedding.astype(np.float32)
+        max_abs = float(np.abs(vector).max()) if vector.size else 0.0
+        scale = max_abs / 127.0 if max_abs > 0 else 1.0
+        quantized = np.clip(np.rint(vector / scale), -127, 127).astype(np.int8)
+        return {
+            "embedding_b64": base64.b64encode(quantized.tobytes()).decode("ascii"),
+            "dtype": "int8",
+            "scale": scale,
+            "zero_point": 0
+        }
+    buf = np.ascontiguousarray(embedding, dtype="<f2").tobytes()
+    return {"embedding_b64": base64.b64encode(buf).decode("ascii"), "dtype": "float16"}
+
+def _model_response(model) -> Response:
+    """
+    Serialize a built response model straight to JSON bytes with pydantic-core,
+    skipping FastAPI's dump/re-validate/encode round trip
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+# Centroid transport formats: base64 float32 bytes (default) or a plain float list for legacy clients
+CENTROID_FORMATS = ("fp32_b64", "fp32_list")
+CENTROID_FORMAT_PATTERN = f"^({'|'.join(CENTROID_FORMATS)})$"
+
+def _encode_centroids(clusters: List[Dict[str, Any]], fmt: str) -> List[Dict[str, Any]]:
+    """Replace each cluster's centroid float list with base64 float32 bytes unless fp32_list is requested"""
+    if fmt == "fp32_list":
+        return clusters
+    
+    encoded = []
+    for cluster in clusters:
+        cluster = dict(cluster)
+        buf = np.asarray(cluster.pop("centroid"), dtype="<f4").tobytes()
+        cluster["centroid_b64"] = base64.b64encode(buf).decode("ascii")
+        cluster["centroid_dtype"] = "float32"
+        encoded.append(cluster)
+    return encoded
+
+# Texts per model call when a batch response is streamed as NDJSON
+STREAM_CHUNK_SIZE = 64
+
+def _ndjson_line(item: Dict[str, Any]) -> bytes:
+    """Serialize one result as a newline-terminated JSON line"""
+    if ORJSON_AVAILABLE:
+        # Engine statistics may hold numpy scalars
+        return orjson.dumps(item, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n"
+    return (json.dumps(item) + "\n").encode("utf-8")
+
+def _ndjson_stream(texts: List[str], batch_fn: Callable[[List[str]], List[Any]],
+                   to_item: Callable[[str, Any], Dict[str, Any]]) -> StreamingResponse:
+    """
+    Stream batch results as NDJSON, one line per text, running the model a chunk at a time
+    so the first lines go out while later texts are still being processed
+    """
+    async def generate():
+        for start in range(0, len(texts), STREAM_CHUNK_SIZE):
+            chunk = texts[start:start + STREAM_CHUNK_SIZE]
+            results = await _run_blocking(batch_fn, chunk)
+            for text, result in zip(chunk, results):
+                yield _ndjson_line(to_item(text, result))
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 @app.get("/")
 async def root():
@@ -83,12 +262,13 @@ async def preprocess_text(request: TextProcessingRequest):
     Preprocess text input with tokenization, cleaning, and normalization
     """
     try:
-        result = text_processor.preprocess(
+        result = await _run_blocking(
+            text_processor.preprocess,
             text=request.text,
             options=request.options
         )
         
-        return TextProcessingResponse(
+        return TextProcessingResponse.build(
             original_text=request.text,
             processed_text=result["processed_text"],
             tokens=result["tokens"],
@@ -104,22 +284,22 @@ async def preprocess_text_batch(request: BatchTextProcessingRequest):
     """
     Batch preprocess multiple text inputs
     """
+    _validate_texts(request.texts)
+    
     try:
+        batch_results = await _run_blocking(text_processor.preprocess_batch, request.texts, options=request.options)
+        
         results = []
-        for text in request.texts:
-            result = text_processor.preprocess(
-                text=text,
-                options=request.options
-            )
-            results.append({
-                "original_text": text,
-                "processed_text": result["processed_text"],
-                "tokens": result["tokens"],
-                "cleaned_text": result["cleaned_text"],
-                "metadata": result["metadata"]
-            })
+        for text, result in zip(request.texts, batch_results):
+            results.append(TextProcessingResponse.build(
+                original_text=text,
+                processed_text=result["processed_text"],
+                tokens=result["tokens"],
+                cleaned_text=result["cleaned_text"],
+                metadata=result["metadata"]
+            ))
         
-        return BatchTextProcessingResponse(results=results)
+        return BatchTextProcessingResponse.build(results=results)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Batch text processing failed: {str(e)}")
@@ -131,7 +311,7 @@ async def normalize_text(request: dict):
     """
     try:
         text = request.get("text", "")
-        normalized = text_processor.normalize_text(text)
+        normalized = await _run_blocking(text_processor.normalize_text, text)
         
         return {
             "original_text": text,
@@ -150,7 +330,7 @@ async def clean_text(request: dict):
         text = request.get("text", "")
         options = request.get("options", {})
         
-        cleaned = text_processor.clean_text(text, options)
+        cleaned = await _run_blocking(text_processor.clean_text, text, options)
         
         return {
             "original_text": text,
@@ -169,7 +349,7 @@ async def tokenize_text(request: dict):
         text = request.get("text", "")
         tokenize_by = request.get("tokenize_by", "words")  # words, sentences, paragraphs
         
-        tokens = text_processor.tokenize(text, tokenize_by)
+        tokens = await _run_blocking(text_processor.tokenize, text, tokenize_by)
         
         return {
             "original_text": text,
@@ -189,14 +369,13 @@ async def analyze_sentiment(request: SentimentAnalysisRequest):
     Analyze sentiment of text with civic discourse focus
     """
     try:
-        import time
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
-        result = sentiment_analyzer.analyze_sentiment(request.text)
+        result = await sentiment_batcher.submit(request.text)
         
-        processing_time = time.time() - start_time
+        processing_time = (time.perf_counter_ns() - start_time) / 1e9
         
-        return SentimentAnalysisResponse(
+        return SentimentAnalysisResponse.build(
             text=request.text,
             sentiment_scores=result["sentiment_scores"],
             sentiment_classification=result["sentiment_classification"],
@@ -216,50 +395,62 @@ async def analyze_sentiment(request: SentimentAnalysisRequest):
         raise HTTPException(status_code=500, detail=f"Sentiment analysis failed: {str(e)}")
 
 @app.post("/sentiment/analyze/batch", response_model=BatchSentimentResponse)
-async def analyze_sentiment_batch(request: BatchSentimentRequest):
+async def analyze_sentiment_batch(request: BatchSentimentRequest, stream: bool = Query(False, description="Stream results as NDJSON")):
     """
     Batch analyze sentiment for multiple texts
     """
+    _validate_texts(request.texts)
+    
+    if stream:
+        return _ndjson_stream(
+            request.texts,
+            sentiment_analyzer.analyze_batch,
+            lambda text, result: _batch_sentiment_item(text, result, request)
+        )
+    
     try:
-        import time
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
-        results = []
-        confidence_scores = []
+        batch_results = await _run_blocking(sentiment_analyzer.analyze_batch, request.texts)
         
-        for text in request.texts:
-            result = sentiment_analyzer.analyze_sentiment(text)
-            confidence_scores.append(result["confidence_score"])
-            
-            results.append(SentimentAnalysisResponse(
-                text=text,
-                sentiment_scores=result["sentiment_scores"],
-                sentiment_classification=result["sentiment_classification"],
-                emotional_indicators=result["emotional_indicators"] if request.include_emotions else [],
-                civic_analysis=result["civic_analysis"] if request.include_civic_analysis else {
-                    "engagement_level": "none",
-                    "tone": "neutral",
-                    "certainty_level": "uncertain"
-                },
-                confidence_score=result["confidence_score"],
-                text_length=result["text_length"],
-                word_count=result["word_count"],
-                processing_time_seconds=0.0  # Individual timing not tracked in batch
-            ))
+        confidence_scores = np.fromiter(
+            (result["confidence_score"] for result in batch_results), dtype=np.float64, count=len(batch_results)
+        )
+        results = [_batch_sentiment_item(text, result, request) for text, result in zip(request.texts, batch_results)]
         
-        processing_time = time.time() - start_time
-        average_confidence = sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0.0
+        processing_time = (time.perf_counter_ns() - start_time) / 1e9
+        average_confidence = float(confidence_scores.mean()) if len(confidence_scores) else 0.0
         
-        return BatchSentimentResponse(
-            results=results,
-            total_analyzed=len(results),
-            average_confidence=round(average_confidence, 3),
-            processing_time_seconds=round(processing_time, 4)
-        )
+        # The analyzer output already has the BatchSentimentResponse shape, so it is
+        # serialized directly instead of being re-validated item by item
+        return RESPONSE_CLASS({
+            "results": results,
+            "total_analyzed": len(results),
+            "average_confidence": round(average_confidence, 3),
+            "processing_time_seconds": round(processing_time, 4)
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Batch sentiment analysis failed: {str(e)}")
 
+def _batch_sentiment_item(text: str, result: Dict[str, Any], request: BatchSentimentRequest) -> Dict[str, Any]:
+    """Build one batch sentiment result (SentimentAnalysisResponse shape), honouring the include flags"""
+    return {
+        "text": text,
+        "sentiment_scores": result["sentiment_scores"],
+        "sentiment_classification": result["sentiment_classification"],
+        "emotional_indicators": result["emotional_indicators"] if request.include_emotions else [],
+        "civic_analysis": result["civic_analysis"] if request.include_civic_analysis else {
+            "engagement_level": "none",
+            "tone": "neutral",
+            "certainty_level": "uncertain"
+        },
+        "confidence_score": result["confidence_score"],
+        "text_length": result["text_length"],
+        "word_count": result["word_count"],
+        "processing_time_seconds": 0.0  # Individual timing not tracked in batch
+    }
+
 @app.post("/sentiment/civic-engagement")
 async def analyze_civic_engagement(request: dict):
     """
@@ -271,7 +462,7 @@ async def analyze_civic_engagement(request: dict):
         if not text:
             raise ValueError("Text is required")
         
-        result = sentiment_analyzer.analyze_sentiment(text)
+        result = await _run_blocking(sentiment_analyzer.analyze_sentiment, text)
         
         return {
             "text": text,
@@ -298,10 +489,10 @@ async def complete_text_analysis(request: dict):
             raise ValueError("Text is required")
         
         # Text preprocessing
-        preprocessing_result = text_processor.preprocess(text=text, options=options)
+        preprocessing_result = await _run_blocking(text_processor.preprocess, text=text, options=options)
         
         # Sentiment analysis
-        sentiment_result = sentiment_analyzer.analyze_sentiment(text)
+        sentiment_result = await _run_blocking(sentiment_analyzer.analyze_sentiment, text)
         
         return {
             "original_text": text,
@@ -322,75 +513,144 @@ async def complete_text_analysis(request: dict):
 # Embeddings Endpoints
 
 @app.post("/embeddings/generate", response_model=EmbeddingResponse)
-async def generate_embedding(request: EmbeddingRequest):
+async def generate_embedding(request: EmbeddingRequest, format: str = Query("fp16_b64", pattern=EMBEDDING_FORMAT_PATTERN)):
     """
     Generate BERT embeddings for text
     """
     try:
-        import time
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
-        embedding = embeddings_generator.generate_embedding(request.text)
-        model_info = embeddings_generator.get_embedding_info()
+        embedding = await embedding_batcher.submit(request.text)
         
-        processing_time = time.time() - start_time
+        processing_time = (time.perf_counter_ns() - start_time) / 1e9
         
-        return EmbeddingResponse(
+        return EmbeddingResponse.build(
             text=request.text,
-            embedding=embedding.tolist(),
+            **_encode_embedding(embedding, format),
             embedding_dimension=len(embedding),
-            model_type=model_info["model_type"]
+            model_type=MODEL_TYPE
         )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Embedding generation failed: {str(e)}")
 
 @app.post("/embeddings/generate/batch", response_model=BatchEmbeddingResponse)
-async def generate_embeddings_batch(request: BatchEmbeddingRequest):
+async def generate_embeddings_batch(request: BatchEmbeddingRequest,
+                                    format: str = Query("fp16_b64", pattern=EMBEDDING_FORMAT_PATTERN),
+                                    stream: bool = Query(False, description="Stream results as NDJSON")):
     """
     Generate BERT embeddings for multiple texts
     """
+    _validate_texts(request.texts)
+    
+    if stream:
+        return _ndjson_stream(
+            request.texts,
+            embeddings_generator.generate_embeddings_batch,
+            lambda text, embedding: {
+                "text": text,
+                **_encode_embedding(embedding, format),
+                "embedding_dimension": len(embedding),
+                "model_type": MODEL_TYPE
+            }
+        )
+    
     try:
-        import time
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
-        embeddings = embeddings_generator.generate_embeddings_batch(request.texts)
-        model_info = embeddings_generator.get_embedding_info()
+        embeddings = await _run_blocking(embeddings_generator.generate_embeddings_batch, request.texts)
         
         results = []
         for text, embedding in zip(request.texts, embeddings):
-            results.append(EmbeddingResponse(
+            results.append(EmbeddingResponse.build(
                 text=text,
-                embedding=embedding.tolist(),
+                **_encode_embedding(embedding, format),
                 embedding_dimension=len(embedding),
-                model_type=model_info["model_type"]
+                model_type=MODEL_TYPE
             ))
         
-        processing_time = time.time() - start_time
+        processing_time = (time.perf_counter_ns() - start_time) / 1e9
         
-        return BatchEmbeddingResponse(
+        return _model_response(BatchEmbeddingResponse.build(
             results=results,
             total_processed=len(results),
             processing_time_seconds=round(processing_time, 4)
-        )
+        ))
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Batch embedding generation failed: {str(e)}")
 
+# Shared-memory embedding blocks handed to local clients, by name; each is unlinked after SHM_TTL_SECONDS
+SHM_TTL_SECONDS = float(os.getenv("NLP_SERVICE_SHM_TTL", "60"))
+_shm_blocks: Dict[str, SharedMemory] = {}
+
+def _is_loopback(host: str) -> bool:
+    """Whether a client address is loopback (127.0.0.0/8, ::1, or IPv4-mapped 127.x)"""
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    # IPv6Address.is_loopback ignores IPv4-mapped addresses before Python 3.13
+    mapped = getattr(address, "ipv4_mapped", None)
+    return (mapped or address).is_loopback
+
+def _release_shm(name: str):
+    """Close and unlink a shared-memory block if it still exists"""
+    shm = _shm_blocks.pop(name, None)
+    if shm is not None:
+        shm.close()
+        shm.unlink()
+
+@app.post("/embeddings/generate/batch/shm")
+async def generate_embeddings_batch_shm(request: BatchEmbeddingRequest, http_request: Request):
+    """
+    Generate embeddings into a shared-memory block for clients on the same host
+    
+    The block holds a C-ordered float16 (N, D) array. It is unlinked after SHM_TTL_SECONDS,
+    so clients should map it (or copy out) promptly.
+    """
+    if http_request.client is None or not _is_loopback(http_request.client.host):
+        raise HTTPException(status_code=403, detail="Shared-memory transport is only available to local clients")
+    _validate_texts(request.texts)
+    
+    try:
+        start_time = time.perf_counter_ns()
+        
+        embeddings = await _run_blocking(embeddings_generator.generate_embeddings_batch, request.texts)
+        matrix = np.stack(embeddings).astype(np.float16)
+        
+        shm = SharedMemory(create=True, size=max(1, matrix.nbytes))
+        np.ndarray(matrix.shape, dtype=matrix.dtype, buffer=shm.buf)[:] = matrix
+        _shm_blocks[shm.name] = shm
+        asyncio.get_running_loop().call_later(SHM_TTL_SECONDS, _release_shm, shm.name)
+        
+        processing_time = (time.perf_counter_ns() - start_time) / 1e9
+        
+        return {
+            "shm_name": shm.name,
+            "shape": list(matrix.shape),
+            "dtype": "float16",
+            "ttl_seconds": SHM_TTL_SECONDS,
+            "model_type": MODEL_TYPE,
+            "processing_time_seconds": round(processing_time, 4)
+        }
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Shared-memory embedding generation failed: {str(e)}")
+
 @app.post("/embeddings/similarity", response_model=SimilarityResponse)
 async def compute_similarity(request: SimilarityRequest):
     """
     Compute cosine similarity between two texts
     """
     try:
-        import time
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
-        similarity = embeddings_generator.compute_similarity(request.text1, request.text2)
+        similarity = await _run_blocking(embeddings_generator.compute_similarity, request.text1, request.text2)
         
-        processing_time = time.time() - start_time
+        processing_time = (time.perf_counter_ns() - start_time) / 1e9
         
-        return SimilarityResponse(
+        return SimilarityResponse.build(
             text1=request.text1,
             text2=request.text2,
             similarity_score=float(similarity),
@@ -405,11 +665,13 @@ async def search_similar_texts(request: SimilarTextSearchRequest):
     """
     Find texts most similar to a query
     """
+    _validate_texts(request.candidate_texts)
+    
     try:
-        import time
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
-        similar_texts = embeddings_generator.find_similar_texts(
+        similar_texts = await _run_blocking(
+            embeddings_generator.find_similar_texts,
             request.query_text,
             request.candidate_texts,
             request.top_k
@@ -422,9 +684,9 @@ async def search_similar_texts(request: SimilarTextSearchRequest):
                 "similarity_score": float(score)
             })
         
-        processing_time = time.time() - start_time
+        processing_time = (time.perf_counter_ns() - start_time) / 1e9
         
-        return SimilarTextSearchResponse(
+        return SimilarTextSearchResponse.build(
             query_text=request.query_text,
             results=results,
             total_candidates=len(request.candidate_texts),
@@ -447,16 +709,22 @@ async def get_embeddings_info():
 # Clustering Endpoints
 
 @app.post("/clustering/analyze", response_model=ClusteringResponse)
-async def cluster_responses(request: ClusteringRequest):
+async def cluster_responses(request: ClusteringRequest,
+                            centroid_format: str = Query("fp32_b64", pattern=CENTROID_FORMAT_PATTERN),
+                            stream: bool = Query(False, description="Stream clusters as NDJSON")):
     """
     Cluster responses using embeddings and identify consensus areas
+    
+    With stream=true the body is NDJSON: one ClusterInfo per line, then a final
+    line holding the remaining ClusteringResponse fields (everything but "clusters")
     """
+    _validate_texts(request.responses)
+    
     try:
-        import time
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
         # Generate embeddings for all responses
-        embeddings = embeddings_generator.generate_embeddings_batch(request.responses)
+        embeddings = await _run_blocking(embeddings_generator.generate_embeddings_batch, request.responses)
         
         # Configure clustering engine
         config = ClusterConfig(
@@ -466,13 +734,15 @@ async def cluster_responses(request: ClusteringRequest):
         )
         
         # Perform clustering
-        clustering_engine.config = config
-        result = clustering_engine.cluster_responses(request.responses, embeddings)
+        result = await _run_blocking(clustering_engine.cluster_responses, request.responses, embeddings, config)
+        
+        processing_time = (time.perf_counter_ns() - start_time) / 1e9
         
-        processing_time = time.time() - start_time
+        if stream:
+            return _ndjson_clusters(result, centroid_format, round(processing_time, 4))
         
-        return ClusteringResponse(
-            clusters=result["clusters"],
+        return _model_response(ClusteringResponse.build(
+            clusters=_encode_centroids(result["clusters"], centroid_format),
             statistics=result["statistics"],
             consensus_areas=result["consensus_areas"],
             total_responses=result["total_responses"],
@@ -480,34 +750,38 @@ async def cluster_responses(request: ClusteringRequest):
             algorithm_used=result["algorithm_used"],
             optimal_clusters=result["optimal_clusters"],
             processing_time_seconds=round(processing_time, 4)
-        )
+        ))
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Clustering failed: {str(e)}")
 
+def _ndjson_clusters(result: Dict[str, Any], centroid_format: str, processing_time: float) -> StreamingResponse:
+    """Stream a clustering result as NDJSON, encoding each cluster's centroid as its line is written"""
+    def generate():
+        for cluster in result["clusters"]:
+            yield _ndjson_line(_encode_centroids([cluster], centroid_format)[0])
+        summary = {key: value for key, value in result.items() if key != "clusters"}
+        summary["processing_time_seconds"] = processing_time
+        yield _ndjson_line(summary)
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
 @app.post("/clustering/complete-analysis")
-async def complete_response_analysis(request: ClusteringRequest):
+async def complete_response_analysis(request: ClusteringRequest,
+                                     centroid_format: str = Query("fp32_b64", pattern=CENTROID_FORMAT_PATTERN)):
     """
     Complete analysis pipeline: preprocessing, sentiment, embeddings, and clustering
     """
+    _validate_texts(request.responses)
+    
     try:
-        import time
-        start_time = time.time()
-        
-        # Step 1: Text preprocessing
-        preprocessing_results = []
-        for text in request.responses:
-            result = text_processor.preprocess(text=text)
-            preprocessing_results.append(result)
-        
-        # Step 2: Sentiment analysis
-        sentiment_results = []
-        for text in request.responses:
-            result = sentiment_analyzer.analyze_sentiment(text)
-            sentiment_results.append(result)
+        start_time = time.perf_counter_ns()
         
-        # Step 3: Generate embeddings
-        embeddings = embeddings_generator.generate_embeddings_batch(request.responses)
+        # Steps 1-3: preprocessing, sentiment and embeddings in one pipeline pass
+        stages = await _run_blocking(nlp_pipeline.run, request.responses)
+        preprocessing_results = stages["preprocessing"]
+        sentiment_results = stages["sentiment"]
+        embeddings = stages["embeddings"]
         
         # Step 4: Clustering
         config = ClusterConfig(
@@ -515,27 +789,44 @@ async def complete_response_analysis(request: ClusteringRequest):
             n_clusters=request.n_clusters or 5,
             min_cluster_size=request.min_cluster_size
         )
-        clustering_engine.config = config
-        clustering_result = clustering_engine.cluster_responses(request.responses, embeddings)
-        
-        processing_time = time.time() - start_time
-        
-        # Calculate overall insights
+        clustering_result = await _run_blocking(clustering_engine.cluster_responses, request.responses, embeddings, config)
+        clustering_result["clusters"] = _encode_centroids(clustering_result["clusters"], centroid_format)
+        
+        processing_time = (time.perf_counter_ns() - start_time) / 1e9
+        
+        # Calculate overall insights from one (N, 3) pass over the sentiment scores
+        score_rows = np.fromiter(
+            (
+                (
+                    s["sentiment_scores"]["polarity"],
+                    s["sentiment_scores"]["civic_engagement"],
+                    s["sentiment_scores"]["constructiveness"]
+                )
+                for s in sentiment_results
+            ),
+            dtype=np.dtype((np.float64, 3)),
+            count=len(sentiment_results)
+        )
+        average_polarity, average_civic_engagement, average_constructiveness = score_rows.mean(axis=0)
         overall_sentiment = {
-            "average_polarity": np.mean([s["sentiment_scores"]["polarity"] for s in sentiment_results]),
-            "average_civic_engagement": np.mean([s["sentiment_scores"]["civic_engagement"] for s in sentiment_results]),
-            "average_constructiveness": np.mean([s["sentiment_scores"]["constructiveness"] for s in sentiment_results]),
+            "average_polarity": float(average_polarity),
+            "average_civic_engagement": float(average_civic_engagement),
+            "average_constructiveness": float(average_constructiveness),
             "dominant_tone": _get_dominant_tone(sentiment_results)
         }
         
-        return {
+        result = {
             "preprocessing": preprocessing_results,
             "sentiment_analysis": sentiment_results,
-            "embeddings": [emb.tolist() for emb in embeddings],
             "clustering": clustering_result,
             "overall_insights": overall_sentiment,
             "processing_time_seconds": round(processing_time, 4)
         }
+        # N x dim floats dominate the payload, so embeddings are opt-in
+        if request.include_embeddings:
+            result["embeddings"] = [_encode_embedding(emb, "fp16_b64")["embedding_b64"] for emb in embeddings]
+        
+        return result
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Complete analysis failed: {str(e)}")
@@ -552,18 +843,18 @@ async def get_clustering_info():
 
 def _get_dominant_tone(sentiment_results: List[Dict]) -> str:
     """Helper method to determine dominant tone"""
-    tones = [result["civic_analysis"]["tone"] for result in sentiment_results]
-    tone_counts = {}
-    for tone in tones:
-        tone_counts[tone] = tone_counts.get(tone, 0) + 1
-    
-    return max(tone_counts.items(), key=lambda x: x[1])[0] if tone_counts else "neutral"
+    tone_counts = Counter(result["civic_analysis"]["tone"] for result in sentiment_results)
+    return tone_counts.most_common(1)[0][0] if tone_counts else "neutral"
 
 if __name__ == "__main__":
+    # Multiple worker processes scale CPU-bound inference past one interpreter;
+    # uvicorn's reloader only supports a single worker
+    workers = int(os.getenv("NLP_SERVICE_WORKERS", "1"))
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8003,
-        reload=True,
+        reload=workers == 1,
+        workers=workers,
         log_level="info"
     ) 
\ No newline at end of file
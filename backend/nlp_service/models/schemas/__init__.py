@@ -0,0 +1,77 @@
+"""
+Pydantic models for NLP service requests and responses
+
+Models live in per-feature submodules that are imported on first attribute
+access (PEP 562), so `from models.schemas import EmbeddingRequest` only loads
+the shared base and the embedding models.
+"""
+
+import importlib
+from typing import List
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "MAX_TEXT_LENGTH": "base",
+    "TextField": "base",
+    "RequestModel": "base",
+    "ResponseModel": "base",
+
+    "ErrorResponse": "errors",
+    "ValidationDetail": "errors",
+    "ValidationErrorResponse": "errors",
+
+    "TokenizeBy": "preprocessing",
+    "ProcessingOptions": "preprocessing",
+    "TextProcessingRequest": "preprocessing",
+    "BatchTextProcessingRequest": "preprocessing",
+    "ProcessingMetadata": "preprocessing",
+    "TextProcessingResponse": "preprocessing",
+    "BatchProcessingResult": "preprocessing",
+    "BatchTextProcessingResponse": "preprocessing",
+    "NormalizationResponse": "preprocessing",
+    "CleaningResponse": "preprocessing",
+    "TokenizationResponse": "preprocessing",
+
+    "EngagementLevel": "sentiment",
+    "DiscourseTone": "sentiment",
+    "CertaintyLevel": "sentiment",
+    "SentimentAnalysisRequest": "sentiment",
+    "SentimentScores": "sentiment",
+    "CivicAnalysis": "sentiment",
+    "SentimentAnalysisResponse": "sentiment",
+    "BatchSentimentRequest": "sentiment",
+    "BatchSentimentResponse": "sentiment",
+
+    "EmbeddingModelType": "embedding",
+    "EmbeddingRequest": "embedding",
+    "BatchEmbeddingRequest": "embedding",
+    "EmbeddingResponse": "embedding",
+    "BatchEmbeddingResponse": "embedding",
+    "SimilarityRequest": "embedding",
+    "SimilarityResponse": "embedding",
+    "SimilarTextSearchRequest": "embedding",
+    "SimilarTextResult": "embedding",
+    "SimilarTextSearchResponse": "embedding",
+
+    "ClusteringAlgorithm": "clustering",
+    "ClusteringRequest": "clustering",
+    "ClusterInfo": "clustering",
+    "ConsensusArea": "clustering",
+    "ClusteringStatistics": "clustering",
+    "ClusteringResponse": "clustering",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name: str):
+    """Import the defining submodule on first access and cache the attribute here"""
+    submodule = _EXPORTS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{submodule}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
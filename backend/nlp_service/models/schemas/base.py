@@ -0,0 +1,48 @@
+"""
+Shared building blocks for the NLP service schemas
+"""
+
+from pydantic import BaseModel, ConfigDict, StringConstraints
+from typing import Dict, Any
+from typing_extensions import Annotated
+from functools import lru_cache
+import json
+import os
+
+_EXAMPLES_PATH = os.path.join(os.path.dirname(__file__), "schema_examples.json")
+
+# Upper bound on any single input text
+MAX_TEXT_LENGTH = 50000
+
+# Shared constrained type for single-text inputs, so every request model reuses one string validator
+TextField = Annotated[str, StringConstraints(min_length=1, max_length=MAX_TEXT_LENGTH)]
+
+def _example(model_name: str):
+    """
+    json_schema_extra hook attaching the model's example from schema_examples.json;
+    the file is only read when an OpenAPI schema is actually generated
+    """
+    def add_example(schema: Dict[str, Any]):
+        schema["example"] = _load_examples()[model_name]
+    return add_example
+
+@lru_cache(maxsize=1)
+def _load_examples() -> Dict[str, Any]:
+    """Example payloads for the OpenAPI docs, keyed by model name"""
+    with open(_EXAMPLES_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+class ResponseModel(BaseModel):
+    """Base for responses assembled by the service from data it already trusts"""
+    # Core schemas are built on first use (route registration) rather than at import
+    model_config = ConfigDict(defer_build=True, extra='ignore')
+    
+    @classmethod
+    def build(cls, **data):
+        """Construct without running validators (ingress models keep normal validation)"""
+        return cls.model_construct(**data)
+
+class RequestModel(BaseModel):
+    """Base for request bodies, which are validated once and then only read"""
+    # Handlers never mutate a request, and nested models are not re-validated on assignment
+    model_config = ConfigDict(frozen=True, revalidate_instances='never')
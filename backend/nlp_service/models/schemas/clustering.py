@@ -0,0 +1,62 @@
+"""
+Response clustering models
+"""
+
+from pydantic import Field
+from typing import Dict, List, Literal, Optional
+from typing_extensions import Annotated, NotRequired, TypedDict
+
+from .base import RequestModel, ResponseModel
+
+# Algorithms ClusteringEngine implements; anything else is rejected with a 422
+ClusteringAlgorithm = Literal["kmeans", "dbscan", "hierarchical"]
+
+class ClusteringRequest(RequestModel):
+    """Request model for response clustering"""
+    responses: Annotated[List[str], Field(min_length=2, max_length=1000)] = Field(..., description="List of responses to cluster")
+    algorithm: ClusteringAlgorithm = Field(default="kmeans", description="Clustering algorithm to use")
+    n_clusters: Optional[int] = Field(default=None, ge=2, le=20, description="Number of clusters (for K-means)")
+    min_cluster_size: int = Field(default=2, ge=1, description="Minimum responses per cluster")
+    include_embeddings: bool = Field(default=False, description="Return response embeddings from the complete analysis")
+
+class ClusterInfo(TypedDict):
+    """Information about a single cluster"""
+    cluster_id: int
+    centroid: NotRequired[List[float]]  # centroid_format=fp32_list only
+    centroid_b64: NotRequired[str]  # base64 of the little-endian centroid bytes
+    centroid_dtype: NotRequired[str]
+    responses: List[str]
+    response_indices: List[int]
+    size: int
+    coherence_score: Annotated[float, Field(ge=0, le=1)]
+    representative_text: str
+
+class ConsensusArea(TypedDict):
+    """Information about a consensus area"""
+    cluster_id: int
+    representative_text: str
+    coherence_score: Annotated[float, Field(ge=0, le=1)]
+    size: int
+    consensus_strength: float
+
+class ClusteringStatistics(TypedDict):
+    """Statistics about clustering results"""
+    total_clusters: int
+    average_cluster_size: float
+    min_cluster_size: int
+    max_cluster_size: int
+    average_coherence: Annotated[float, Field(ge=0, le=1)]
+    min_coherence: Annotated[float, Field(ge=0, le=1)]
+    max_coherence: Annotated[float, Field(ge=0, le=1)]
+    cluster_size_distribution: Dict[str, int]
+
+class ClusteringResponse(ResponseModel):
+    """Response model for clustering operation"""
+    clusters: List[ClusterInfo]
+    statistics: ClusteringStatistics
+    consensus_areas: List[ConsensusArea]
+    total_responses: int
+    total_clusters: int
+    algorithm_used: ClusteringAlgorithm
+    optimal_clusters: int
+    processing_time_seconds: float
@@ -0,0 +1,67 @@
+"""
+Embedding, similarity and similar-text search models
+"""
+
+from pydantic import Field
+from typing import List, Literal, Optional
+from typing_extensions import Annotated, TypedDict
+
+from .base import RequestModel, ResponseModel, TextField
+
+# Backends EmbeddingsGenerator can load
+EmbeddingModelType = Literal["sentence_transformers", "transformers", "tfidf"]
+
+class EmbeddingRequest(RequestModel):
+    """Request model for text embedding generation"""
+    text: TextField = Field(..., description="Text to generate embeddings for")
+
+class BatchEmbeddingRequest(RequestModel):
+    """Request model for batch embedding generation"""
+    texts: Annotated[List[str], Field(min_length=1, max_length=100)] = Field(..., description="List of texts to generate embeddings for")
+
+class EmbeddingResponse(ResponseModel):
+    """Response model for text embedding"""
+    text: str
+    embedding: Optional[List[float]] = Field(default=None, description="Embedding vector as floats (format=fp32_list only)")
+    embedding_b64: Optional[str] = Field(default=None, description="Base64 of the little-endian embedding bytes")
+    dtype: str = Field(default="float16", description="Element type of embedding_b64 or embedding")
+    scale: Optional[float] = Field(default=None, description="int8 only: value = quantized * scale")
+    zero_point: Optional[int] = Field(default=None, description="int8 only: always 0 (symmetric)")
+    embedding_dimension: int
+    model_type: EmbeddingModelType
+
+class BatchEmbeddingResponse(ResponseModel):
+    """Response model for batch embedding generation"""
+    results: List[EmbeddingResponse]
+    total_processed: int
+    processing_time_seconds: float
+
+class SimilarityRequest(RequestModel):
+    """Request model for text similarity computation"""
+    text1: TextField = Field(..., description="First text")
+    text2: TextField = Field(..., description="Second text")
+
+class SimilarityResponse(ResponseModel):
+    """Response model for text similarity"""
+    text1: str
+    text2: str
+    similarity_score: float = Field(..., ge=0, le=1)
+    processing_time_seconds: float
+
+class SimilarTextSearchRequest(RequestModel):
+    """Request model for finding similar texts"""
+    query_text: TextField = Field(..., description="Query text to find similarities for")
+    candidate_texts: Annotated[List[str], Field(min_length=1, max_length=1000)] = Field(..., description="Candidate texts to search through")
+    top_k: int = Field(default=5, ge=1, le=50, description="Number of top results to return")
+
+class SimilarTextResult(TypedDict):
+    """Single result in similar text search"""
+    text: str
+    similarity_score: Annotated[float, Field(ge=0, le=1)]
+
+class SimilarTextSearchResponse(ResponseModel):
+    """Response model for similar text search"""
+    query_text: str
+    results: List[SimilarTextResult]
+    total_candidates: int
+    processing_time_seconds: float
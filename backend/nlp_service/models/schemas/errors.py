@@ -0,0 +1,39 @@
+"""
+Error response models
+"""
+
+from pydantic import BaseModel, Field
+from typing import List, Optional, Tuple, Union
+from typing_extensions import TypedDict
+from datetime import datetime
+import time
+
+# (epoch second, datetime for that second); replaced as a whole so threads never see half an update
+_timestamp_cache = [(0, None)]
+
+def _now_cached() -> datetime:
+    """Error timestamp at one-second resolution, shared by every error raised within that second"""
+    second = int(time.time())
+    cached_second, value = _timestamp_cache[0]
+    if second != cached_second or value is None:
+        value = datetime.fromtimestamp(second)
+        _timestamp_cache[0] = (second, value)
+    return value
+
+class ErrorResponse(BaseModel):
+    """Standard error response"""
+    error: str = Field(..., description="Error message")
+    detail: Optional[str] = Field(default=None, description="Detailed error information")
+    timestamp: datetime = Field(default_factory=_now_cached, description="Error timestamp")
+
+class ValidationDetail(TypedDict):
+    """One entry of a request validation failure"""
+    loc: Tuple[Union[str, int], ...]
+    msg: str
+    type: str
+
+class ValidationErrorResponse(BaseModel):
+    """Validation error response"""
+    error: str = Field(default="Validation Error", description="Error type")
+    details: List[ValidationDetail] = Field(..., description="Validation error details")
+    timestamp: datetime = Field(default_factory=_now_cached, description="Error timestamp")
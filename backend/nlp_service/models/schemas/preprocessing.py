@@ -0,0 +1,100 @@
+"""
+Text preprocessing request and response models
+"""
+
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Literal, Optional
+from typing_extensions import Annotated, NotRequired, TypedDict
+
+from .base import RequestModel, ResponseModel, TextField, _example
+
+# Modes TextProcessor.tokenize understands
+TokenizeBy = Literal["words", "sentences", "paragraphs", "wordpunct"]
+
+# Containers that are only ever built server-side from engine output are TypedDicts:
+# pydantic validates them as plain dicts instead of constructing a model per item.
+
+class ProcessingOptions(BaseModel):
+    """Text processing configuration options"""
+    # Only used nested inside request models, which build it on demand
+    model_config = ConfigDict(defer_build=True, extra='ignore', frozen=True)
+    
+    remove_punctuation: bool = Field(default=True, description="Remove punctuation marks")
+    remove_numbers: bool = Field(default=False, description="Remove numeric tokens")
+    remove_stopwords: bool = Field(default=False, description="Remove common stopwords")
+    lowercase: bool = Field(default=True, description="Convert text to lowercase")
+    remove_extra_whitespace: bool = Field(default=True, description="Normalize whitespace")
+    remove_urls: bool = Field(default=True, description="Remove URL patterns")
+    remove_emails: bool = Field(default=True, description="Remove email addresses")
+    remove_html: bool = Field(default=True, description="Remove HTML tags")
+    normalize_unicode: bool = Field(default=True, description="Normalize unicode characters")
+    stem_words: bool = Field(default=False, description="Apply word stemming")
+    lemmatize_words: bool = Field(default=False, description="Apply word lemmatization")
+    min_word_length: int = Field(default=1, ge=1, description="Minimum word length")
+    max_word_length: int = Field(default=50, le=100, description="Maximum word length")
+    preserve_sentence_structure: bool = Field(default=False, description="Maintain sentence boundaries")
+
+class TextProcessingRequest(RequestModel):
+    """Request model for text preprocessing"""
+    text: TextField = Field(..., description="Text to process")
+    options: Optional[ProcessingOptions] = Field(default=None, description="Processing configuration")
+    
+    model_config = ConfigDict(json_schema_extra=_example("TextProcessingRequest"))
+
+class BatchTextProcessingRequest(RequestModel):
+    """Request model for batch text preprocessing"""
+    texts: Annotated[List[str], Field(min_length=1, max_length=100)] = Field(..., description="List of texts to process")
+    options: Optional[ProcessingOptions] = Field(default=None, description="Processing configuration")
+    
+    model_config = ConfigDict(json_schema_extra=_example("BatchTextProcessingRequest"))
+
+class ProcessingMetadata(TypedDict):
+    """Metadata about text processing operations"""
+    original_length: int
+    final_length: int
+    token_count: int
+    compression_ratio: float
+    processing_steps: List[str]
+    language: NotRequired[str]
+    civic_terms_found: NotRequired[List[str]]
+    tokens_filtered: NotRequired[Optional[int]]
+    processing_complete: NotRequired[bool]
+    error: NotRequired[Optional[str]]
+
+class TextProcessingResponse(ResponseModel):
+    """Response model for text preprocessing"""
+    original_text: str
+    processed_text: str
+    tokens: List[str]
+    cleaned_text: str
+    metadata: ProcessingMetadata
+    
+    model_config = ConfigDict(json_schema_extra=_example("TextProcessingResponse"))
+
+# Batch items have exactly the single-text response shape; kept as a name for existing imports
+BatchProcessingResult = TextProcessingResponse
+
+class BatchTextProcessingResponse(ResponseModel):
+    """Response model for batch text preprocessing"""
+    results: List[TextProcessingResponse]
+    
+    model_config = ConfigDict(json_schema_extra=_example("BatchTextProcessingResponse"))
+
+# Additional response models for specific endpoints
+
+class NormalizationResponse(ResponseModel):
+    """Response for text normalization"""
+    original_text: str
+    normalized_text: str
+
+class CleaningResponse(ResponseModel):
+    """Response for text cleaning"""
+    original_text: str
+    cleaned_text: str
+
+class TokenizationResponse(ResponseModel):
+    """Response for text tokenization"""
+    original_text: str
+    tokens: List[str]
+    token_count: int
+    tokenize_by: TokenizeBy
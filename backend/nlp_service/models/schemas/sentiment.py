@@ -0,0 +1,69 @@
+"""
+Sentiment analysis request and response models
+"""
+
+from pydantic import Field
+from typing import List, Literal
+from typing_extensions import Annotated
+
+from .base import RequestModel, ResponseModel, TextField
+
+# Labels produced by SentimentAnalyzer's civic classifiers (and its error fallback)
+EngagementLevel = Literal["high", "moderate", "low", "none"]
+DiscourseTone = Literal["constructive_positive", "constructive_critical", "destructive_negative",
+                        "enthusiastic", "critical", "neutral"]
+CertaintyLevel = Literal["highly_certain", "moderately_certain", "somewhat_uncertain",
+                         "highly_uncertain", "uncertain"]
+
+class SentimentAnalysisRequest(RequestModel):
+    """Request model for sentiment analysis"""
+    text: TextField = Field(..., description="Text to analyze for sentiment")
+    include_emotions: bool = Field(default=True, description="Include emotional indicators")
+    include_civic_analysis: bool = Field(default=True, description="Include civic discourse analysis")
+
+class SentimentScores(ResponseModel):
+    """Detailed sentiment scores"""
+    polarity: float = Field(..., ge=-1, le=1, description="Sentiment polarity (-1 negative to 1 positive)")
+    subjectivity: float = Field(..., ge=0, le=1, description="Subjectivity (0 objective to 1 subjective)")
+    certainty: float = Field(..., ge=0, le=1, description="Certainty level (0 uncertain to 1 certain)")
+    civic_engagement: float = Field(..., ge=0, le=1)
+    emotional_intensity: float = Field(..., ge=0, le=1)
+    constructiveness: float = Field(..., ge=0, le=1)
+
+class CivicAnalysis(ResponseModel):
+    """Civic discourse analysis"""
+    engagement_level: EngagementLevel
+    tone: DiscourseTone
+    certainty_level: CertaintyLevel
+
+class SentimentAnalysisResponse(ResponseModel):
+    """Response model for sentiment analysis"""
+    text: str
+    sentiment_scores: SentimentScores
+    sentiment_classification: str
+    emotional_indicators: List[str]
+    civic_analysis: CivicAnalysis
+    confidence_score: float = Field(..., ge=0, le=1)
+    text_length: int
+    word_count: int
+    processing_time_seconds: float
+    
+    @classmethod
+    def build(cls, **data):
+        """Construct without validation, building the nested score and civic models too"""
+        data["sentiment_scores"] = SentimentScores.build(**data["sentiment_scores"])
+        data["civic_analysis"] = CivicAnalysis.build(**data["civic_analysis"])
+        return cls.model_construct(**data)
+
+class BatchSentimentRequest(RequestModel):
+    """Request model for batch sentiment analysis"""
+    texts: Annotated[List[str], Field(min_length=1, max_length=100)] = Field(..., description="List of texts to analyze")
+    include_emotions: bool = Field(default=True, description="Include emotional indicators")
+    include_civic_analysis: bool = Field(default=True, description="Include civic discourse analysis")
+
+class BatchSentimentResponse(ResponseModel):
+    """Response model for batch sentiment analysis"""
+    results: List[SentimentAnalysisResponse]
+    total_analyzed: int
+    average_confidence: float
+    processing_time_seconds: float
@@ -1,36 +1,330 @@
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import re
 import hashlib
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 from datetime import datetime
+import os
 import time
+import asyncio
+import functools
+import threading
+from collections import OrderedDict
 from threading import Semaphore
+import numpy as np
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401 - enables httpx's HTTP/2 support
+    H2_AVAILABLE = True
+except ImportError:
+    H2_AVAILABLE = False
+
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+try:
+    from sklearn.cluster import AgglomerativeClustering, KMeans
+    from sklearn.decomposition import PCA
+    from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class OllamaClient:
+# JSON in a markdown code block, the widest {...} span, and the text around a JSON object
+_CODE_BLOCK_RE = re.compile(r'```(?:json)?\s*([\{\[].*?[\}\]])\s*```', re.DOTALL)
+_JSON_RE = re.compile(r'\{.*\}', re.DOTALL)
+_LEADING_TEXT_RE = re.compile(r'^.*?(\{)', re.DOTALL)
+_TRAILING_TEXT_RE = re.compile(r'(\}).*?$', re.DOTALL)
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+def _json_loads(text):
     """
-    Client for interacting with Ollama for local AI analysis.
-    Simplified for reliability and stability.
+    Parse JSON with orjson when it is installed (orjson.JSONDecodeError subclasses json.JSONDecodeError).
     """
+    return orjson.loads(text) if ORJSON_AVAILABLE else json.loads(text)
+
+def _json_body(data: Dict[str, Any]) -> bytes:
+    """
+    Encode a request body as JSON bytes.
+    """
+    return orjson.dumps(data) if ORJSON_AVAILABLE else json.dumps(data).encode()
+
+def _format_insight_response(response: Any) -> str:
+    """
+    Render one response for the generate_insights prompt.
+    """
+    if isinstance(response, dict):
+        return f"Inquiry: {response.get('inquiry_title', '')}\nResponse: {response.get('content', '')}"
+    return str(response)
+
+SENTENCE_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+# How long Ollama keeps the model loaded after a call
+KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+
+# Responses mapped per Ollama call by map_responses_to_statements_batch
+MAPPING_BATCH_SIZE = 10
+
+# Attempts per Ollama request on transient failures (backoff 0.5 s, 1 s between them)
+REQUEST_ATTEMPTS = 3
+
+# Consecutive failed attempts that open the circuit, and how long it then rejects requests
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_OPEN_SECONDS = 30
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling Ollama while the circuit breaker is open.
+    """
+
+@functools.lru_cache(maxsize=None)
+def _sentence_model(model_name: str = SENTENCE_MODEL_NAME):
+    """
+    Load a sentence-transformers model once per process.
+    """
+    if not SENTENCE_TRANSFORMERS_AVAILABLE:
+        raise ImportError("sentence-transformers is required for local embeddings")
+    return SentenceTransformer(model_name)
+
+class _SemanticPartition:
+    """
+    Key vectors for one (model, system prompt) pair, in a FAISS index or a numpy matrix.
+    """
+    
+    def __init__(self):
+        self.index = None
+        self.ids = np.empty(0, dtype=np.int64)
+        self.vectors = None
+        self.size = 0
     
-    def __init__(self, base_url: str = "http://localhost:11434", model: str = "llama3.2:3b"):
+    def search(self, vector: np.ndarray) -> Tuple[Optional[int], float]:
+        """
+        Nearest id and its similarity (None when empty).
+        """
+        if self.size == 0:
+            return None, 0.0
+        if self.index is not None:
+            scores, ids = self.index.search(vector, 1)
+            return int(ids[0, 0]), float(scores[0, 0])
+        scores = self.vectors @ vector[0]
+        best = int(np.argmax(scores))
+        return int(self.ids[best]), float(scores[best])
+    
+    def add(self, entry_id: int, vector: np.ndarray):
+        """
+        Index a (1, dim) key vector under entry_id.
+        """
+        if FAISS_AVAILABLE:
+            if self.index is None:
+                self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(vector.shape[1]))
+            self.index.add_with_ids(vector, np.array([entry_id], dtype=np.int64))
+        else:
+            self.vectors = vector if self.vectors is None else np.vstack([self.vectors, vector])
+            self.ids = np.append(self.ids, entry_id)
+        self.size += 1
+    
+    def remove(self, entry_id: int):
+        """
+        Drop entry_id's key vector.
+        """
+        if self.index is not None:
+            self.index.remove_ids(np.array([entry_id], dtype=np.int64))
+        else:
+            keep = self.ids != entry_id
+            self.ids = self.ids[keep]
+            self.vectors = self.vectors[keep]
+        self.size -= 1
+
+class SemanticCache:
+    """
+    LRU cache of generated responses, so paraphrased requests are served without another LLM call.
+    
+    Only the user prompt is embedded: a long shared system prompt would use up the embedding
+    model's 256-token window and make unrelated requests look alike. Entries are instead
+    partitioned by the exact (model, system prompt) pair, and a lookup only searches its own
+    partition.
+    """
+    
+    def __init__(self, tau: float = 0.87, max_entries: int = 1024, model_name: str = SENTENCE_MODEL_NAME):
+        """
+        Args:
+            tau: Minimum cosine similarity for a hit
+            max_entries: Entries kept (across all partitions) before the least recently used is evicted
+            model_name: sentence-transformers model used for the keys
+        """
+        self.tau = tau
+        self.max_entries = max_entries
+        self.model_name = model_name
+        
+        # id -> (partition key, response), in LRU order
+        self._responses = OrderedDict()
+        self._partitions: Dict[Tuple[str, str], _SemanticPartition] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+    
+    def _embed(self, prompt: str) -> np.ndarray:
+        """
+        L2-normalized float32 key embedding of the user prompt, shape (1, dim).
+        """
+        embedding = _sentence_model(self.model_name).encode([prompt], normalize_embeddings=True)
+        return np.ascontiguousarray(embedding, dtype=np.float32)
+    
+    def get(self, model: str, system_prompt: Optional[str], prompt: str) -> Optional[str]:
+        """
+        Cached response for a similar enough prompt under the same model and system prompt, or None.
+        """
+        key = (model, system_prompt or "")
+        if key not in self._partitions:
+            return None
+        
+        vector = self._embed(prompt)
+        with self._lock:
+            partition = self._partitions.get(key)
+            if partition is None:
+                return None
+            entry_id, score = partition.search(vector)
+            if entry_id is None or score < self.tau or entry_id not in self._responses:
+                return None
+            self._responses.move_to_end(entry_id)
+            return self._responses[entry_id][1]
+    
+    def put(self, model: str, system_prompt: Optional[str], prompt: str, response: str):
+        """
+        Store a generated response, evicting the least recently used entry when full.
+        """
+        key = (model, system_prompt or "")
+        vector = self._embed(prompt)
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._responses[entry_id] = (key, response)
+            self._partitions.setdefault(key, _SemanticPartition()).add(entry_id, vector)
+            
+            if len(self._responses) > self.max_entries:
+                evicted, (evicted_key, _) = self._responses.popitem(last=False)
+                partition = self._partitions[evicted_key]
+                partition.remove(evicted)
+                if partition.size == 0:
+                    del self._partitions[evicted_key]
+
+def _semantic_cache_from_env() -> Optional[SemanticCache]:
+    """
+    SemanticCache configured by OLLAMA_SEMANTIC_CACHE_TAU / OLLAMA_SEMANTIC_CACHE_SIZE,
+    or None when the tau variable is unset (the cache is opt-in).
+    """
+    tau = os.getenv("OLLAMA_SEMANTIC_CACHE_TAU")
+    if not tau or not SENTENCE_TRANSFORMERS_AVAILABLE:
+        return None
+    return SemanticCache(tau=float(tau), max_entries=int(os.getenv("OLLAMA_SEMANTIC_CACHE_SIZE", "1024")))
+
+class JsonObjectScanner:
+    """
+    One-pass brace scanner that finds the first complete top-level JSON object in text
+    that arrives in pieces (string contents and escapes are skipped).
+    """
+    
+    def __init__(self):
+        self._text = ""
+        self._position = 0
+        self._start = -1
+        self._depth = 0
+        self._in_string = False
+        self._escape_next = False
+    
+    def feed(self, chunk: str) -> Optional[str]:
+        """
+        Add text and scan it.
+        
+        Args:
+            chunk: Next piece of the text
+            
+        Returns:
+            The first complete JSON object once its closing brace has been seen, else None
+        """
+        self._text += chunk
+        text = self._text
+        
+        if self._start == -1:
+            self._start = text.find('{', self._position)
+            if self._start == -1:
+                self._position = len(text)
+                return None
+            self._position = self._start
+        
+        for i in range(self._position, len(text)):
+            char = text[i]
+            if self._escape_next:
+                self._escape_next = False
+                continue
+            if char == '\\':
+                self._escape_next = True
+                continue
+            if char == '"':
+                self._in_string = not self._in_string
+                continue
+            if self._in_string:
+                continue
+            if char == '{':
+                self._depth += 1
+            elif char == '}':
+                self._depth -= 1
+                if self._depth == 0:
+                    return text[self._start:i + 1]
+        
+        self._position = len(text)
+        return None
+
+class OllamaBase:
+    """
+    Configuration, caching and response parsing shared by the sync and async clients.
+    """
+    
+    def __init__(self, base_url: str = "http://localhost:11434", model: str = "llama3.2:3b",
+                 semantic_cache: Optional[SemanticCache] = None):
         self.base_url = base_url
         self.model = model  # Use smaller 3b model for stability
         self.api_url = f"{base_url}/api"
-        self.timeout = 60  # Longer timeout for stability
-        self.max_retries = 1  # Reduce retries to avoid overload
         
         # Simple caching system
         self.cache = {}
         self.cache_ttl = 300  # 5 minutes
         
-        # Request management - limit concurrent requests for stability
-        self.semaphore = Semaphore(1)  # Only 1 concurrent request for stability
+        # Bounded exact-match cache of generated text, checked before the semantic cache
+        self._exact_cache = OrderedDict()
+        self.exact_cache_size = 1024
+        self._exact_cache_lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+        
+        # Optional paraphrase-tolerant cache in front of generation
+        self.semantic_cache = semantic_cache
         
     def _extract_nested_json(self, text: str) -> Optional[str]:
         """
@@ -42,33 +336,7 @@ class OllamaClient:
         Returns:
             Extracted JSON string or None
         """
-        start = text.find('{')
-        if start == -1:
-            return None
-
-        depth = 0
-        in_string = False
-        escape_next = False
-
-        for i, char in enumerate(text[start:], start):
-            if escape_next:
-                escape_next = False
-                continue
-            if char == '\\':
-                escape_next = True
-                continue
-            if char == '"' and not escape_next:
-                in_string = not in_string
-                continue
-            if in_string:
-                continue
-            if char == '{':
-                depth += 1
-            elif char == '}':
-                depth -= 1
-                if depth == 0:
-                    return text[start:i+1]
-        return None
+        return JsonObjectScanner().feed(text)
 
     def _extract_json_from_response(self, response: str) -> Optional[Dict[str, Any]]:
         """
@@ -88,7 +356,7 @@ class OllamaClient:
         # Strategy 0: Handle JSON array responses (LLMs sometimes return arrays)
         if stripped.startswith('['):
             try:
-                result = json.loads(stripped)
+                result = _json_loads(stripped)
                 if isinstance(result, list) and len(result) > 0:
                     if isinstance(result[0], dict):
                         return result[0]  # Return first object from array
@@ -98,7 +366,7 @@ class OllamaClient:
 
         # Strategy 1: Try to parse the entire response as JSON
         try:
-            return json.loads(stripped)
+            return _json_loads(stripped)
         except json.JSONDecodeError:
             pass
 
@@ -106,17 +374,17 @@ class OllamaClient:
         try:
             json_str = self._extract_nested_json(response)
             if json_str:
-                return json.loads(json_str)
+                return _json_loads(json_str)
         except json.JSONDecodeError:
             pass
 
         # Strategy 3: Extract JSON from markdown code blocks
         try:
             # Look for JSON in markdown code blocks (handle both object and array)
-            code_block_match = re.search(r'```(?:json)?\s*([\{\[].*?[\}\]])\s*```', response, re.DOTALL)
+            code_block_match = _CODE_BLOCK_RE.search(response)
             if code_block_match:
                 block_content = code_block_match.group(1)
-                parsed = json.loads(block_content)
+                parsed = _json_loads(block_content)
                 if isinstance(parsed, list) and len(parsed) > 0:
                     return parsed[0] if isinstance(parsed[0], dict) else {"items": parsed}
                 return parsed
@@ -125,20 +393,18 @@ class OllamaClient:
 
         # Strategy 4: Simple first/last brace extraction (fallback for malformed responses)
         try:
-            start = response.find("{")
-            end = response.rfind("}") + 1
-            if start != -1 and end > start:
-                json_str = response[start:end]
-                return json.loads(json_str)
+            match = _JSON_RE.search(response)
+            if match:
+                return _json_loads(match.group(0))
         except json.JSONDecodeError:
             pass
 
         # Strategy 5: Try to clean the response and extract JSON
         try:
             # Remove common non-JSON prefixes and suffixes
-            cleaned = re.sub(r'^.*?(\{)', r'\1', response, flags=re.DOTALL)
-            cleaned = re.sub(r'(\}).*?$', r'\1', cleaned, flags=re.DOTALL)
-            return json.loads(cleaned)
+            cleaned = _LEADING_TEXT_RE.sub(r'\1', response)
+            cleaned = _TRAILING_TEXT_RE.sub(r'\1', cleaned)
+            return _json_loads(cleaned)
         except json.JSONDecodeError:
             pass
 
@@ -176,7 +442,319 @@ class OllamaClient:
         """
         return time.time() - timestamp < self.cache_ttl
     
-    def _make_request(self, endpoint: str, data: Dict[str, Any], use_cache: bool = True) -> Dict[str, Any]:
+    def _exact_key(self, prompt: str, system_prompt: Optional[str], json_only: bool = False) -> str:
+        """
+        SHA-256 key for a (model, system prompt, prompt) triple; json_only replies
+        (cut off after their JSON object) are keyed separately from full ones.
+        """
+        payload = json.dumps({"m": self.model, "s": system_prompt, "p": prompt, "j": json_only}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+    
+    def _exact_get(self, key: str) -> Optional[str]:
+        """
+        Look up a generated response by exact key, refreshing its LRU position.
+        """
+        with self._exact_cache_lock:
+            cached = self._exact_cache.get(key)
+            if cached is None:
+                self.stats["misses"] += 1
+                return None
+            self._exact_cache.move_to_end(key)
+            self.stats["hits"] += 1
+            return cached
+    
+    def _exact_put(self, key: str, response: str):
+        """
+        Store a generated response, evicting the least recently used entry when full.
+        """
+        with self._exact_cache_lock:
+            self._exact_cache[key] = response
+            self._exact_cache.move_to_end(key)
+            if len(self._exact_cache) > self.exact_cache_size:
+                self._exact_cache.popitem(last=False)
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """
+        Exact-match cache hit/miss counters and current size.
+        """
+        with self._exact_cache_lock:
+            return {**self.stats, "size": len(self._exact_cache)}
+    
+    def _chat_payload(self, prompt: str, system_prompt: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Build the /api/chat request body.
+        
+        The system prompt goes first as its own message so calls sharing it share a token
+        prefix, and keep_alive holds the model (and its cached prefix) in memory between calls.
+        """
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        
+        return {
+            "model": self.model,
+            "messages": messages,
+            "stream": False,
+            "keep_alive": KEEP_ALIVE
+        }
+    
+    def _mapping_prompts(self, response_text: str, statements: List[str]) -> Tuple[str, str]:
+        """
+        Build the (system prompt, prompt) pair for mapping one response to statements.
+        """
+        system_prompt = """You are an expert at analyzing how participant responses relate to key statements. For each statement provided, determine whether the given response agrees, disagrees, or is neutral/passes on that statement.
+
+        Return a JSON response with the following structure:
+        {
+            "mapping": [
+                {
+                    "statement": "exact statement text",
+                    "position": "agree|disagree|pass"
+                }
+            ]
+        }
+        
+        Guidelines:
+        - "agree": The response clearly supports or aligns with the statement
+        - "disagree": The response clearly opposes or contradicts the statement  
+        - "pass": The response is neutral, unclear, or doesn't address the statement"""
+        
+        statements_text = "\n".join([f"{i+1}. {stmt}" for i, stmt in enumerate(statements)])
+        prompt = f"""Response to analyze: "{response_text}"
+
+Statements to map against:
+{statements_text}
+
+For each statement, determine if the response agrees, disagrees, or passes."""
+        return system_prompt, prompt
+    
+    def _parse_mapping(self, response: str, statements: List[str]) -> Dict[str, Any]:
+        """
+        Parse a mapping response, marking any statement the model skipped as "pass".
+        """
+        fallback_structure = {"mapping": [{"statement": stmt, "position": "pass"} for stmt in statements]}
+        parsed_result = self._extract_simple_json(response, fallback_structure)
+        return self._complete_mapping(parsed_result.get("mapping", []), statements)
+    
+    def _complete_mapping(self, mapping: List[Dict[str, Any]], statements: List[str]) -> Dict[str, Any]:
+        """
+        Ensure all statements are covered, adding "pass" for any the model skipped.
+        """
+        covered_statements = {m.get("statement", "") for m in mapping}
+        for statement in statements:
+            if statement not in covered_statements:
+                mapping.append({
+                    "statement": statement,
+                    "position": "pass"
+                })
+        
+        return {"mapping": mapping}
+    
+    def _batch_mapping_prompts(self, response_texts: List[str], statements: List[str]) -> Tuple[str, str]:
+        """
+        Build the (system prompt, prompt) pair for mapping several responses in one call.
+        """
+        system_prompt = """You are an expert at analyzing how participant responses relate to key statements. For each numbered response and each statement provided, determine whether the response agrees, disagrees, or is neutral/passes on that statement.
+
+        Return a JSON response with the following structure, with one entry in "results" per response:
+        {
+            "results": [
+                {
+                    "response": 1,
+                    "mapping": [
+                        {
+                            "statement": "exact statement text",
+                            "position": "agree|disagree|pass"
+                        }
+                    ]
+                }
+            ]
+        }
+        
+        Guidelines:
+        - "agree": The response clearly supports or aligns with the statement
+        - "disagree": The response clearly opposes or contradicts the statement
+        - "pass": The response is neutral, unclear, or doesn't address the statement"""
+        
+        statements_text = "\n".join([f"{i+1}. {stmt}" for i, stmt in enumerate(statements)])
+        responses_text = "\n".join([f"Response {i+1}: \"{text}\"" for i, text in enumerate(response_texts)])
+        prompt = f"""Responses to analyze:
+{responses_text}
+
+Statements to map against:
+{statements_text}
+
+For each response and each statement, determine if the response agrees, disagrees, or passes."""
+        return system_prompt, prompt
+    
+    def _parse_batch_mapping(self, response: str, count: int, statements: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Parse a batched mapping reply into one mapping per response (None where it is missing).
+        """
+        parsed = self._extract_json_from_response(response) or {}
+        results = parsed.get("results")
+        mappings = [None] * count
+        if not isinstance(results, list):
+            return mappings
+        
+        for position, item in enumerate(results):
+            if not isinstance(item, dict) or not isinstance(item.get("mapping"), list):
+                continue
+            try:
+                index = int(item.get("response", position + 1)) - 1
+            except (TypeError, ValueError):
+                index = position
+            if 0 <= index < count and mappings[index] is None:
+                mappings[index] = self._complete_mapping(item["mapping"], statements)
+        return mappings
+
+# System prompts that vary per call are templates, formatted with only their variable part
+
+CLUSTER_SYSTEM_PROMPT = """You are a clustering expert. Group the given responses into {num_clusters} clusters based on similarity of ideas and themes. 
+
+Return a JSON response with the following structure:
+{{
+    "clusters": [
+        {{
+            "id": "cluster_1",
+            "theme": "main theme of this cluster",
+            "response_indices": [1, 2],
+            "summary": "summary of this cluster's main points"
+        }}
+    ],
+    "overall_summary": "summary of all clusters"
+}}
+
+IMPORTANT: In the "response_indices" field, return the NUMBERS (1, 2, 3, etc.) corresponding to the numbered responses. Do not include the actual response text."""
+
+KEYWORDS_SYSTEM_PROMPT = """You are a keyword extraction expert. Analyze the following responses and extract the top {max_words} most important keywords or key phrases, along with their frequency counts. Return a JSON response with the following structure:\n{{\n  \"keywords\": [{{\"word\": \"keyword1\", \"frequency\": 5}}, ...]\n}}"""
+
+ROUND_INSIGHTS_SYSTEM_PROMPT = """You are a civic engagement expert analyzing round {round_number} of a dialogue. 
+        Based on the responses and the round context, provide insights that build on previous rounds."""
+
+# Appended after any additional instructions
+ROUND_INSIGHTS_FORMAT = """
+        Return a JSON response with the following structure:
+        {
+            "key_themes": ["theme1", "theme2"],
+            "common_concerns": ["concern1", "concern2"],
+            "suggested_actions": ["action1", "action2"],
+            "consensus_points": ["consensus1", "consensus2"],
+            "dialogue_opportunities": ["opportunity1", "opportunity2"],
+            "common_desired_outcomes": ["shared goal1", "shared goal2"],
+            "common_strategies": ["agreed approach1", "agreed approach2"],
+            "common_values": ["shared principle1", "shared principle2"],
+            "participant_sentiment": "overall sentiment",
+            "summary": "comprehensive summary of findings for this round"
+        }"""
+
+class OllamaClient(OllamaBase):
+    """
+    Client for interacting with Ollama for local AI analysis.
+    Simplified for reliability and stability.
+    """
+    
+    def __init__(self, base_url: str = "http://localhost:11434", model: str = "llama3.2:3b",
+                 semantic_cache: Optional[SemanticCache] = None):
+        super().__init__(base_url, model, semantic_cache)
+        self.timeout = 60  # Longer timeout for stability
+        self.max_retries = 1  # Reduce retries to avoid overload
+        
+        # Request management - limit concurrent requests for stability
+        self.semaphore = Semaphore(1)  # Only 1 concurrent request for stability
+        
+        # Pooled keep-alive session so repeated calls reuse one TCP connection
+        self.session = requests.Session()
+        self.session.headers.update({"Connection": "keep-alive", "Accept-Encoding": "gzip, deflate"})
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
+        # Circuit breaker state, guarded by the lock
+        self._consecutive_failures = 0
+        self._circuit_open_until = 0.0
+        self._circuit_lock = threading.Lock()
+        
+    def close(self):
+        """
+        Close the pooled HTTP session.
+        """
+        self.session.close()
+    
+    @staticmethod
+    def _is_transient(error: requests.exceptions.RequestException) -> bool:
+        """
+        Whether a failed request is worth retrying: connection errors, timeouts and 5xx responses.
+        """
+        if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                              requests.exceptions.ChunkedEncodingError)):
+            return True
+        response = getattr(error, "response", None)
+        return isinstance(error, requests.exceptions.HTTPError) and response is not None and response.status_code >= 500
+    
+    def _check_circuit(self):
+        """
+        Raise CircuitOpenError while the circuit breaker is open.
+        """
+        with self._circuit_lock:
+            remaining = self._circuit_open_until - time.monotonic()
+        if remaining > 0:
+            raise CircuitOpenError(f"Ollama circuit open after repeated failures, retry in {remaining:.0f} seconds")
+    
+    def _record_result(self, success: bool):
+        """
+        Update the consecutive failure count and open the circuit once it reaches the threshold.
+        """
+        with self._circuit_lock:
+            if success:
+                self._consecutive_failures = 0
+                return
+            self._consecutive_failures += 1
+            if self._consecutive_failures >= CIRCUIT_FAILURE_THRESHOLD:
+                self._circuit_open_until = time.monotonic() + CIRCUIT_OPEN_SECONDS
+                logger.warning(f"Opening Ollama circuit for {CIRCUIT_OPEN_SECONDS}s after "
+                               f"{self._consecutive_failures} consecutive failures")
+    
+    def _with_retry(self, send, attempts: int = REQUEST_ATTEMPTS):
+        """
+        Call send() with exponential backoff on transient failures, failing fast while the circuit is open.
+        
+        This is the only retry policy for Ollama requests; non-transient errors are raised at once.
+        
+        Args:
+            send: Zero-argument callable performing one HTTP attempt
+            attempts: Maximum attempts for transient failures
+            
+        Returns:
+            Whatever send returns
+        """
+        for attempt in range(attempts):
+            self._check_circuit()
+            try:
+                result = send()
+            except requests.exceptions.RequestException as e:
+                if not self._is_transient(e):
+                    logger.error(f"Ollama API request failed: {e}")
+                    raise Exception(f"Ollama API request failed: {e}")
+                
+                self._record_result(False)
+                if attempt == attempts - 1:
+                    logger.error(f"Ollama API request failed after {attempts} attempts: {e}")
+                    if isinstance(e, requests.exceptions.Timeout):
+                        raise Exception(f"Ollama API request timed out after 45 seconds")
+                    raise Exception(f"Ollama API request failed: {e}")
+                
+                wait_time = 0.5 * 2 ** attempt
+                logger.warning(f"Ollama API request failed ({e}), retrying in {wait_time} seconds")
+                time.sleep(wait_time)
+                continue
+            
+            self._record_result(True)
+            return result
+    
+    def _make_request(self, endpoint: str, data: Dict[str, Any], use_cache: bool = True,
+                      attempts: int = REQUEST_ATTEMPTS) -> Dict[str, Any]:
         """
         Make a request to the Ollama API with caching and semaphore.
         
@@ -184,42 +762,90 @@ class OllamaClient:
             endpoint: API endpoint
             data: Request data
             use_cache: Whether to use caching
+            attempts: Maximum attempts for transient failures
             
         Returns:
             API response
         """
-        # Check cache first
-        if use_cache:
-            cache_key = self._get_cache_key(endpoint, data)
-            if cache_key in self.cache:
-                cached_result, timestamp = self.cache[cache_key]
-                if self._is_cache_valid(timestamp):
-                    logger.info(f"Cache hit for {endpoint}")
-                    return cached_result
+        # Check cache first
+        if use_cache:
+            cache_key = self._get_cache_key(endpoint, data)
+            if cache_key in self.cache:
+                cached_result, timestamp = self.cache[cache_key]
+                if self._is_cache_valid(timestamp):
+                    logger.info(f"Cache hit for {endpoint}")
+                    return cached_result
+        
+        url = f"{self.api_url}/{endpoint}"
+        body = _json_body(data)
+        
+        def send():
+            # Increased timeout for local processing
+            response = self.session.post(url, data=body, headers=JSON_HEADERS, timeout=45)
+            response.raise_for_status()
+            return _json_loads(response.content)
+        
+        # Acquire semaphore to limit concurrent requests
+        with self.semaphore:
+            try:
+                result = self._with_retry(send, attempts)
+            except CircuitOpenError:
+                # Serve an expired cached result rather than nothing while Ollama is down
+                if use_cache and cache_key in self.cache:
+                    logger.warning(f"Circuit open, serving stale cached result for {endpoint}")
+                    return self.cache[cache_key][0]
+                raise
+        
+        # Cache the result
+        if use_cache:
+            self.cache[cache_key] = (result, time.time())
+            logger.info(f"Cached result for {endpoint}")
+        
+        return result
+    
+    def _make_request_stream(self, endpoint: str, data: Dict[str, Any], attempts: int = REQUEST_ATTEMPTS) -> str:
+        """
+        Stream a chat generation and return as soon as the first JSON object in it is complete.
+        
+        Closing the stream early makes Ollama stop generating, so trailing prose after the
+        object is never produced.
+        
+        Args:
+            endpoint: API endpoint
+            data: Request data
+            attempts: Maximum attempts for transient failures
+            
+        Returns:
+            The first complete JSON object, or all generated text if none closed
+        """
+        url = f"{self.api_url}/{endpoint}"
+        body = _json_body({**data, "stream": True})
         
-        # Acquire semaphore to limit concurrent requests
-        with self.semaphore:
-            try:
-                url = f"{self.api_url}/{endpoint}"
-                # Increased timeout for local processing
-                response = requests.post(url, json=data, timeout=45)
+        def send():
+            # A retried attempt starts the generation over
+            scanner = JsonObjectScanner()
+            parts = []
+            with self.session.post(url, data=body, headers=JSON_HEADERS, timeout=45, stream=True) as response:
                 response.raise_for_status()
-                result = response.json()
-                
-                # Cache the result
-                if use_cache:
-                    self.cache[cache_key] = (result, time.time())
-                    logger.info(f"Cached result for {endpoint}")
-                
-                return result
-            except requests.exceptions.Timeout as e:
-                logger.error(f"Ollama API request timed out: {e}")
-                raise Exception(f"Ollama API request timed out after 45 seconds")
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Ollama API request failed: {e}")
-                raise Exception(f"Ollama API request failed: {e}")
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = _json_loads(line)
+                    content = chunk.get("message", {}).get("content", "")
+                    parts.append(content)
+                    
+                    found = scanner.feed(content)
+                    if found is not None:
+                        return found
+                    if chunk.get("done"):
+                        break
+            return "".join(parts)
+        
+        with self.semaphore:
+            return self._with_retry(send, attempts)
     
-    def generate_response(self, prompt: str, system_prompt: str = None, use_cache: bool = True, max_retries: int = 2) -> str:
+    def generate_response(self, prompt: str, system_prompt: str = None, use_cache: bool = True, max_retries: int = 2,
+                          stream_json: bool = False, semantic: bool = False) -> str:
         """
         Generate a response using Ollama with retry logic.
         
@@ -227,33 +853,50 @@ class OllamaClient:
             prompt: User prompt
             system_prompt: System prompt (optional)
             use_cache: Whether to use caching
-            max_retries: Maximum retry attempts
+            max_retries: Maximum retries of transient HTTP failures (other errors are not retried)
+            stream_json: Stream the generation and stop once the first JSON object is complete
+                (for callers that only parse that object)
+            semantic: Also consult the semantic cache. Opt in only for prompts whose answer doesn't
+                depend on exact wording or list positions: "I support X" and "I oppose X" embed too
+                closely to share an answer, and a paraphrased response list would reuse another
+                list's indices
             
         Returns:
             Generated response
         """
-        data = {
-            "model": self.model,
-            "prompt": prompt,
-            "stream": False
-        }
+        if use_cache:
+            exact_key = self._exact_key(prompt, system_prompt, stream_json)
+            cached = self._exact_get(exact_key)
+            if cached is not None:
+                return cached
         
-        if system_prompt:
-            data["system"] = system_prompt
+        semantic_cache = self.semantic_cache if use_cache and semantic else None
+        if semantic_cache is not None:
+            cached = semantic_cache.get(self.model, system_prompt, prompt)
+            if cached is not None:
+                return cached
         
-        for attempt in range(max_retries + 1):
-            try:
-                response = self._make_request("generate", data, use_cache)
-                return response.get("response", "")
-            except Exception as e:
-                logger.error(f"Attempt {attempt + 1} failed: {e}")
-                if attempt < max_retries:
-                    wait_time = 2 ** attempt  # Exponential backoff
-                    logger.info(f"Retrying in {wait_time} seconds...")
-                    time.sleep(wait_time)
-                else:
-                    logger.error(f"All attempts failed for prompt: {prompt[:100]}...")
-                    return f"Error generating response: {e}"
+        data = self._chat_payload(prompt, system_prompt)
+        
+        # Retries happen in _with_retry; any failure here is final and callers fall back to their default result
+        try:
+            if stream_json:
+                text = self._make_request_stream("chat", data, attempts=max_retries + 1)
+            else:
+                response = self._make_request("chat", data, use_cache, attempts=max_retries + 1)
+                text = response.get("message", {}).get("content", "")
+        except CircuitOpenError as e:
+            logger.warning(f"Skipping generation: {e}")
+            return f"Error generating response: {e}"
+        except Exception as e:
+            logger.error(f"Generation failed for prompt: {prompt[:100]}...: {e}")
+            return f"Error generating response: {e}"
+        
+        if use_cache:
+            self._exact_put(exact_key, text)
+        if semantic_cache is not None:
+            semantic_cache.put(self.model, system_prompt, prompt, text)
+        return text
     
     def analyze_sentiment(self, text: str) -> Dict[str, Any]:
         """
@@ -276,7 +919,7 @@ class OllamaClient:
         prompt = f"Analyze the sentiment of this text: {text}"
         
         try:
-            response = self.generate_response(prompt, system_prompt, use_cache=True)
+            response = self.generate_response(prompt, system_prompt, use_cache=True, stream_json=True)
             fallback_structure = {
                 "sentiment": "neutral",
                 "confidence": 0.5,
@@ -331,7 +974,7 @@ class OllamaClient:
         prompt = f"Analyze the sentiment of these texts:\n{texts_with_index}"
         
         try:
-            response = self.generate_response(prompt, system_prompt, use_cache=True)
+            response = self.generate_response(prompt, system_prompt, use_cache=True, stream_json=True)
             fallback_structure = {
                 "results": [
                     {
@@ -359,7 +1002,11 @@ class OllamaClient:
     
     def cluster_responses(self, responses: List[str], num_clusters: int = 3) -> Dict[str, Any]:
         """
-        Cluster similar responses using Ollama and generate 2D coordinates for visualization.
+        Cluster similar responses and generate 2D coordinates for visualization.
+        
+        Clustering runs locally on sentence embeddings when sentence-transformers and
+        scikit-learn are installed (Ollama only names the clusters); otherwise Ollama
+        does the grouping and points are laid out on circles.
         Args:
             responses: List of response texts
             num_clusters: Number of clusters to create
@@ -369,43 +1016,128 @@ class OllamaClient:
         if not responses:
             return {"clusters": [], "summary": "No responses to cluster"}
         
-        system_prompt = f"""You are a clustering expert. Group the given responses into {num_clusters} clusters based on similarity of ideas and themes. 
+        if SENTENCE_TRANSFORMERS_AVAILABLE and SKLEARN_AVAILABLE:
+            try:
+                return self._cluster_locally(responses, num_clusters)
+            except Exception as e:
+                logger.warning(f"Local clustering failed, falling back to Ollama: {e}")
+        
+        return self._cluster_with_llm(responses, num_clusters)
+    
+    def _cluster_locally(self, responses: List[str], num_clusters: int) -> Dict[str, Any]:
+        """
+        K-means over normalized MiniLM embeddings, with a PCA projection for the 2D layout.
+        """
+        embeddings = _sentence_model().encode(responses, normalize_embeddings=True)
+        n = len(responses)
+        k = max(1, min(num_clusters, n))
+        
+        if k > 1:
+            labels = KMeans(n_clusters=k, n_init=4, random_state=42).fit_predict(embeddings)
+        else:
+            labels = np.zeros(n, dtype=int)
+        coords = PCA(n_components=2).fit_transform(embeddings) if n >= 2 else np.zeros((n, 2))
+        
+        clusters = []
+        for label in range(k):
+            indices = np.flatnonzero(labels == label)
+            if len(indices) == 0:
+                continue
+            
+            # Members ordered by similarity to the centroid, most representative first
+            centroid = embeddings[indices].mean(axis=0)
+            indices = indices[np.argsort(-(embeddings[indices] @ centroid))]
+            
+            clusters.append({
+                "id": f"cluster_{len(clusters) + 1}",
+                "response_indices": (indices + 1).tolist(),
+                "points": [
+                    {"x": float(coords[i, 0]), "y": float(coords[i, 1]), "text": responses[i]}
+                    for i in indices
+                ]
+            })
+        
+        overall_summary = self._label_clusters(clusters, responses)
+        return {"clusters": clusters, "overall_summary": overall_summary}
+    
+    def _label_clusters(self, clusters: List[Dict[str, Any]], responses: List[str]) -> str:
+        """
+        Fill in each cluster's theme and summary with one Ollama call over a few
+        representative responses per cluster; returns the overall summary.
+        """
+        # Fallback labels: the most representative response of each cluster
+        for cluster in clusters:
+            representative = responses[cluster["response_indices"][0] - 1]
+            cluster["theme"] = representative if len(representative) <= 60 else representative[:57] + "..."
+            cluster["summary"] = f"{len(cluster['response_indices'])} similar responses"
+        overall_summary = f"{len(responses)} responses grouped into {len(clusters)} clusters"
+        
+        system_prompt = """You are a clustering expert. Each numbered cluster below lists representative responses that were grouped together. Give each cluster a short theme and a one-sentence summary.
 
 Return a JSON response with the following structure:
-{{
+{
     "clusters": [
-        {{
-            "id": "cluster_1",
+        {
+            "cluster": 1,
             "theme": "main theme of this cluster",
-            "response_indices": [1, 2],
             "summary": "summary of this cluster's main points"
-        }}
+        }
     ],
     "overall_summary": "summary of all clusters"
-}}
-
-IMPORTANT: In the "response_indices" field, return the NUMBERS (1, 2, 3, etc.) corresponding to the numbered responses. Do not include the actual response text."""
+}"""
+        clusters_text = "\n\n".join(
+            f"Cluster {c + 1}:\n" + "\n".join(f"- {responses[i - 1]}" for i in cluster["response_indices"][:3])
+            for c, cluster in enumerate(clusters)
+        )
+        prompt = f"Name these clusters of responses:\n{clusters_text}"
+        
+        try:
+            response = self.generate_response(prompt, system_prompt, use_cache=True, stream_json=True)
+            parsed = self._extract_json_from_response(response) or {}
+        except Exception as e:
+            logger.error(f"Cluster labelling failed: {e}")
+            return overall_summary
+        
+        labels = parsed.get("clusters")
+        if isinstance(labels, list):
+            for position, item in enumerate(labels):
+                if not isinstance(item, dict):
+                    continue
+                try:
+                    index = int(item.get("cluster", position + 1)) - 1
+                except (TypeError, ValueError):
+                    index = position
+                if 0 <= index < len(clusters):
+                    if item.get("theme"):
+                        clusters[index]["theme"] = item["theme"]
+                    if item.get("summary"):
+                        clusters[index]["summary"] = item["summary"]
+        return parsed.get("overall_summary") or overall_summary
+    
+    def _cluster_with_llm(self, responses: List[str], num_clusters: int) -> Dict[str, Any]:
+        """
+        Ask Ollama to group the responses, then lay each cluster's points out on a circle.
+        """
+        system_prompt = CLUSTER_SYSTEM_PROMPT.format(num_clusters=num_clusters)
         
         responses_text = "\n".join([f"{i+1}. {response}" for i, response in enumerate(responses)])
         prompt = f"Cluster these responses:\n{responses_text}"
         
         try:
-            response = self.generate_response(prompt, system_prompt, use_cache=True)
+            response = self.generate_response(prompt, system_prompt, use_cache=True, stream_json=True)
             fallback_structure = {"clusters": [], "overall_summary": "No clusters generated"}
             parsed = self._extract_simple_json(response, fallback_structure)
             
             if parsed and "clusters" in parsed:
                 
                 # Add 2D coordinates for each response in each cluster
-                import math
                 clusters = parsed.get("clusters", [])
                 total_clusters = len(clusters)
                 
                 for cidx, cluster in enumerate(clusters):
-                    points = []
+                    texts = []
                     # Try both 'response_indices' (new format) and 'responses' (fallback)
                     cluster_indices = cluster.get("response_indices", cluster.get("responses", []))
-                    n = len(cluster_indices)
                     
                     for ridx, resp_index in enumerate(cluster_indices):
                         # Convert response index to actual response text
@@ -437,19 +1169,15 @@ IMPORTANT: In the "response_indices" field, return the NUMBERS (1, 2, 3, etc.) c
                             else:
                                 actual_text = f"Response text not available"
                         
-                        # Spread points in a circle per cluster
-                        angle = 2 * math.pi * ridx / max(n, 1)
-                        radius = 0.5 + 0.5 * cidx  # Different radius per cluster
-                        x = radius * math.cos(angle)
-                        y = radius * math.sin(angle)
-                        
-                        points.append({
-                            "x": x, 
-                            "y": y, 
-                            "text": actual_text
-                        })
+                        texts.append(actual_text)
                     
-                    cluster["points"] = points
+                    # Spread points in a circle per cluster
+                    radius = 0.5 + 0.5 * cidx  # Different radius per cluster
+                    angles = np.linspace(0, 2 * np.pi, len(texts), endpoint=False)
+                    xs = (radius * np.cos(angles)).tolist()
+                    ys = (radius * np.sin(angles)).tolist()
+                    
+                    cluster["points"] = [{"x": x, "y": y, "text": text} for x, y, text in zip(xs, ys, texts)]
                 
                 parsed["clusters"] = clusters
                 return parsed
@@ -491,16 +1219,7 @@ IMPORTANT: In the "response_indices" field, return the NUMBERS (1, 2, 3, etc.) c
         }"""
         
         # Prepare response data for analysis
-        response_texts = []
-        for response in responses:
-            if isinstance(response, dict):
-                content = response.get('content', '')
-                inquiry_title = response.get('inquiry_title', '')
-                response_texts.append(f"Inquiry: {inquiry_title}\nResponse: {content}")
-            else:
-                response_texts.append(str(response))
-        
-        responses_text = "\n\n".join(response_texts)
+        responses_text = "\n\n".join(map(_format_insight_response, responses))
         
         prompt = f"""Event: {event_data.get('title', 'Unknown Event')}
 Description: {event_data.get('description', 'No description')}
@@ -511,7 +1230,7 @@ Responses:
 Please analyze these responses and provide insights."""
         
         try:
-            response = self.generate_response(prompt, system_prompt, use_cache=True)
+            response = self.generate_response(prompt, system_prompt, use_cache=True, stream_json=True)
             fallback_structure = {
                 "key_themes": [],
                 "common_concerns": [],
@@ -556,29 +1275,14 @@ Please analyze these responses and provide insights."""
             Generated insights with round-specific analysis
         """
         # Build system prompt with additional instructions if provided
-        base_system_prompt = f"""You are a civic engagement expert analyzing round {round_number} of a dialogue. 
-        Based on the responses and the round context, provide insights that build on previous rounds."""
+        base_system_prompt = ROUND_INSIGHTS_SYSTEM_PROMPT.format(round_number=round_number)
         
         if additional_instructions:
             base_system_prompt += "\n\nAdditional instructions:\n" + "\n".join([f"- {inst}" for inst in additional_instructions])
         
-        base_system_prompt += """
-        Return a JSON response with the following structure:
-        {
-            "key_themes": ["theme1", "theme2"],
-            "common_concerns": ["concern1", "concern2"],
-            "suggested_actions": ["action1", "action2"],
-            "consensus_points": ["consensus1", "consensus2"],
-            "dialogue_opportunities": ["opportunity1", "opportunity2"],
-            "common_desired_outcomes": ["shared goal1", "shared goal2"],
-            "common_strategies": ["agreed approach1", "agreed approach2"],
-            "common_values": ["shared principle1", "shared principle2"],
-            "participant_sentiment": "overall sentiment",
-            "summary": "comprehensive summary of findings for this round"
-        }"""
+        base_system_prompt += ROUND_INSIGHTS_FORMAT
         
-        response_texts = [resp.get('content', '') for resp in responses]
-        responses_text = "\n\n".join(response_texts)
+        responses_text = "\n\n".join(resp.get('content', '') for resp in responses)
         
         prompt = f"""Event: {event_data.get('title', 'Unknown Event')}
 Round {round_number} Responses:
@@ -588,7 +1292,7 @@ Please analyze these round-specific responses and provide insights."""
         
         try:
             # Use temperature parameter in the generation if supported
-            response = self.generate_response(prompt, base_system_prompt, use_cache=True)
+            response = self.generate_response(prompt, base_system_prompt, use_cache=True, stream_json=True)
             logger.info(f"[DEBUG] Ollama raw response for round {round_number}: {response}")
             
             fallback_structure = {
@@ -659,7 +1363,7 @@ And keeping in mind the previous questions that have already been asked:
 Please generate the next set of inquiries."""
 
         try:
-            response_str = self.generate_response(prompt, system_prompt, use_cache=False)  # Don't cache inquiries
+            response_str = self.generate_response(prompt, system_prompt, use_cache=False, stream_json=True)  # Don't cache inquiries
             fallback_structure = {"inquiries": []}
             parsed_json = self._extract_simple_json(response_str, fallback_structure)
             
@@ -682,7 +1386,7 @@ Please generate the next set of inquiries."""
             Health status
         """
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=5)
             if response.status_code == 200:
                 models = response.json().get("models", [])
                 model_names = [model.get("name", "") for model in models]
@@ -704,6 +1408,43 @@ Please generate the next set of inquiries."""
             }
 
     def extract_keywords(self, responses: List[str], max_words: int = 50) -> Dict[str, Any]:
+        """
+        Extract keywords and their frequencies from a list of responses.
+        
+        Terms are ranked by summed TF-IDF over unigrams and bigrams; without scikit-learn
+        this falls back to extract_keywords_llm.
+        Args:
+            responses: List of response texts
+            max_words: Maximum number of keywords to return
+        Returns:
+            Dict with 'keywords': list of {word, frequency}
+        """
+        if not responses:
+            return {"keywords": []}
+        if not SKLEARN_AVAILABLE:
+            return self.extract_keywords_llm(responses, max_words)
+        
+        # One tokenization pass: raw counts give the frequencies, TF-IDF the ranking
+        vectorizer = CountVectorizer(ngram_range=(1, 2), stop_words='english', max_features=2000)
+        try:
+            counts = vectorizer.fit_transform(responses)
+        except ValueError:
+            # Every response was empty or stopwords only
+            return {"keywords": []}
+        
+        scores = np.asarray(TfidfTransformer().fit_transform(counts).sum(axis=0)).ravel()
+        frequencies = np.asarray(counts.sum(axis=0)).ravel()
+        terms = vectorizer.get_feature_names_out()
+        
+        if max_words < len(scores):
+            top = np.argpartition(-scores, max_words)[:max_words]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        
+        return {"keywords": [{"word": terms[i], "frequency": int(frequencies[i])} for i in top]}
+    
+    def extract_keywords_llm(self, responses: List[str], max_words: int = 50) -> Dict[str, Any]:
         """
         Extract keywords and their frequencies from a list of responses using Ollama.
         Args:
@@ -714,11 +1455,11 @@ Please generate the next set of inquiries."""
         """
         if not responses:
             return {"keywords": []}
-        system_prompt = f"""You are a keyword extraction expert. Analyze the following responses and extract the top {max_words} most important keywords or key phrases, along with their frequency counts. Return a JSON response with the following structure:\n{{\n  \"keywords\": [{{\"word\": \"keyword1\", \"frequency\": 5}}, ...]\n}}"""
+        system_prompt = KEYWORDS_SYSTEM_PROMPT.format(max_words=max_words)
         responses_text = "\n".join([f"- {response}" for response in responses])
         prompt = f"Extract keywords from these responses:\n{responses_text}"
         try:
-            response = self.generate_response(prompt, system_prompt, use_cache=True)
+            response = self.generate_response(prompt, system_prompt, use_cache=True, stream_json=True)
             fallback_structure = {"keywords": []}
             return self._extract_simple_json(response, fallback_structure)
         except Exception as e:
@@ -727,7 +1468,10 @@ Please generate the next set of inquiries."""
 
     def detect_consensus(self, responses: List[str]) -> Dict[str, Any]:
         """
-        Detect consensus and disagreement among responses using Ollama.
+        Detect consensus and disagreement among responses.
+        
+        Uses agglomerative clustering over sentence embeddings when sentence-transformers
+        and scikit-learn are installed, and Ollama otherwise.
         Args:
             responses: List of response texts
         Returns:
@@ -735,11 +1479,69 @@ Please generate the next set of inquiries."""
         """
         if not responses:
             return {"consensus_clusters": [], "summary": "No responses to analyze"}
+        
+        if SENTENCE_TRANSFORMERS_AVAILABLE and SKLEARN_AVAILABLE:
+            try:
+                return self._detect_consensus_locally(responses)
+            except Exception as e:
+                logger.warning(f"Local consensus detection failed, falling back to Ollama: {e}")
+        
+        return self._detect_consensus_llm(responses)
+    
+    def _detect_consensus_locally(self, responses: List[str]) -> Dict[str, Any]:
+        """
+        Group responses whose embeddings are within cosine distance 0.3 of each other;
+        a group's agreement score is the mean pairwise similarity of its members.
+        """
+        embeddings = _sentence_model().encode(responses, normalize_embeddings=True)
+        similarity = embeddings @ embeddings.T
+        
+        if len(responses) > 1:
+            labels = AgglomerativeClustering(
+                n_clusters=None, distance_threshold=0.3, metric="cosine", linkage="average"
+            ).fit_predict(embeddings)
+        else:
+            labels = np.zeros(1, dtype=int)
+        
+        consensus_clusters = []
+        for label in np.unique(labels):
+            indices = np.flatnonzero(labels == label)
+            size = len(indices)
+            block = similarity[np.ix_(indices, indices)]
+            # Mean over distinct pairs; a lone response agrees with nobody
+            agreement = (block.sum() - np.trace(block)) / (size * (size - 1)) if size > 1 else 0.0
+            
+            # The member closest to all others stands in as the cluster's label
+            representative = responses[indices[np.argmax(block.sum(axis=1))]]
+            if len(representative) > 80:
+                representative = representative[:77] + "..."
+            
+            consensus_clusters.append({
+                "cluster_label": f"Agreement on: {representative}" if size > 1 else f"Single view: {representative}",
+                "responses": [responses[i] for i in indices],
+                "agreement_score": round(float(np.clip(agreement, 0.0, 1.0)), 3)
+            })
+        
+        consensus_clusters.sort(key=lambda c: (len(c["responses"]), c["agreement_score"]), reverse=True)
+        
+        shared = [c for c in consensus_clusters if len(c["responses"]) > 1]
+        if shared:
+            summary = (f"{len(responses)} responses form {len(consensus_clusters)} groups; "
+                       f"{sum(len(c['responses']) for c in shared)} responses share a view with at least one other, "
+                       f"the largest group holding {len(shared[0]['responses'])}.")
+        else:
+            summary = f"No two of the {len(responses)} responses express closely matching views."
+        return {"consensus_clusters": consensus_clusters, "summary": summary}
+    
+    def _detect_consensus_llm(self, responses: List[str]) -> Dict[str, Any]:
+        """
+        Ask Ollama to group the responses by agreement.
+        """
         system_prompt = """You are a consensus detection expert. Group the following responses into clusters of agreement and disagreement. For each cluster, provide a label, the responses in that cluster, and an agreement_score from 0 (no agreement) to 1 (full agreement). Return a JSON response with the following structure:\n{\n  \"consensus_clusters\": [\n    {\n      \"cluster_label\": \"Agreement on X\",\n      \"responses\": [\"response1\", ...],\n      \"agreement_score\": 0.8\n    }\n  ],\n  \"summary\": \"brief summary of consensus and disagreement\"\n}"""
         responses_text = "\n".join([f"- {response}" for response in responses])
         prompt = f"Detect consensus in these responses:\n{responses_text}"
         try:
-            response = self.generate_response(prompt, system_prompt, use_cache=True)
+            response = self.generate_response(prompt, system_prompt, use_cache=True, stream_json=True)
             fallback_structure = {"consensus_clusters": [], "summary": "Unable to parse consensus results"}
             return self._extract_simple_json(response, fallback_structure)
         except Exception as e:
@@ -777,7 +1579,7 @@ Please generate the next set of inquiries."""
         prompt = f"Extract key statements from these responses:\n\n{responses_text}"
         
         try:
-            response = self.generate_response(prompt, system_prompt, use_cache=True)
+            response = self.generate_response(prompt, system_prompt, use_cache=True, stream_json=True)
             fallback_structure = {"statements": ["Unable to extract statements"]}
             parsed_result = self._extract_simple_json(response, fallback_structure)
             
@@ -810,53 +1612,200 @@ Please generate the next set of inquiries."""
         """
         if not statements:
             return {"mapping": []}
-            
-        system_prompt = """You are an expert at analyzing how participant responses relate to key statements. For each statement provided, determine whether the given response agrees, disagrees, or is neutral/passes on that statement.
-
-        Return a JSON response with the following structure:
-        {
-            "mapping": [
-                {
-                    "statement": "exact statement text",
-                    "position": "agree|disagree|pass"
-                }
-            ]
-        }
         
-        Guidelines:
-        - "agree": The response clearly supports or aligns with the statement
-        - "disagree": The response clearly opposes or contradicts the statement  
-        - "pass": The response is neutral, unclear, or doesn't address the statement"""
+        system_prompt, prompt = self._mapping_prompts(response_text, statements)
         
-        statements_text = "\n".join([f"{i+1}. {stmt}" for i, stmt in enumerate(statements)])
-        prompt = f"""Response to analyze: "{response_text}"
+        try:
+            response = self.generate_response(prompt, system_prompt, use_cache=True, stream_json=True)
+            return self._parse_mapping(response, statements)
+        except Exception as e:
+            logger.error(f"Response mapping failed: {e}")
+            # Return default pass mapping for all statements
+            return {"mapping": [{"statement": stmt, "position": "pass"} for stmt in statements]}
 
-Statements to map against:
-{statements_text}
+    def map_responses_to_statements_batch(self, response_texts: List[str], statements: List[str]) -> List[Dict[str, Any]]:
+        """
+        Map many responses to the same statements with one Ollama call per chunk of responses.
+        
+        Args:
+            response_texts: Responses to map
+            statements: List of extracted statements
+            
+        Returns:
+            One mapping result per response, in input order
+        """
+        if not statements:
+            return [{"mapping": []} for _ in response_texts]
+        
+        results = []
+        for start in range(0, len(response_texts), MAPPING_BATCH_SIZE):
+            chunk = response_texts[start:start + MAPPING_BATCH_SIZE]
+            system_prompt, prompt = self._batch_mapping_prompts(chunk, statements)
+            try:
+                response = self.generate_response(prompt, system_prompt, use_cache=True, stream_json=True)
+                mappings = self._parse_batch_mapping(response, len(chunk), statements)
+            except Exception as e:
+                logger.error(f"Batch response mapping failed: {e}")
+                mappings = [None] * len(chunk)
+            
+            # Responses the batched reply left out are mapped one at a time
+            for response_text, mapping in zip(chunk, mappings):
+                results.append(mapping if mapping is not None else self.map_response_to_statements(response_text, statements))
+        return results
 
-For each statement, determine if the response agrees, disagrees, or passes."""
+class AsyncOllamaClient(OllamaBase):
+    """
+    Async Ollama client for fanning out many independent calls (e.g. one mapping per response)
+    over a shared connection pool.
+    
+    HTTP/2 is used when the optional h2 package is installed; httpx only negotiates it over
+    TLS, so a plain-http Ollama keeps using pooled HTTP/1.1 keep-alive connections.
+    """
+    
+    def __init__(self, base_url: str = "http://localhost:11434", model: str = "llama3.2:3b",
+                 max_concurrency: int = 4, semantic_cache: Optional[SemanticCache] = None):
+        """
+        Args:
+            base_url: Ollama server URL
+            model: Model used for generation
+            max_concurrency: Requests allowed in flight at once (Ollama queues the rest itself)
+            semantic_cache: Optional paraphrase-tolerant response cache
+        """
+        if not HTTPX_AVAILABLE:
+            raise ImportError("httpx is required for AsyncOllamaClient")
         
-        try:
-            response = self.generate_response(prompt, system_prompt, use_cache=True)
-            fallback_structure = {"mapping": [{"statement": stmt, "position": "pass"} for stmt in statements]}
-            parsed_result = self._extract_simple_json(response, fallback_structure)
+        super().__init__(base_url, model, semantic_cache)
+        self.client = httpx.AsyncClient(
+            http2=H2_AVAILABLE,
+            limits=httpx.Limits(max_keepalive_connections=40, max_connections=100, keepalive_expiry=30.0),
+            timeout=httpx.Timeout(300.0, connect=10.0)
+        )
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def aclose(self):
+        """
+        Close the underlying connection pool.
+        """
+        await self.client.aclose()
+    
+    async def _make_request(self, endpoint: str, data: Dict[str, Any], use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Make a request to the Ollama API with caching and a concurrency limit.
+        
+        Args:
+            endpoint: API endpoint
+            data: Request data
+            use_cache: Whether to use caching
             
-            mapping = parsed_result.get("mapping", [])
+        Returns:
+            API response
+        """
+        if use_cache:
+            cache_key = self._get_cache_key(endpoint, data)
+            if cache_key in self.cache:
+                cached_result, timestamp = self.cache[cache_key]
+                if self._is_cache_valid(timestamp):
+                    logger.info(f"Cache hit for {endpoint}")
+                    return cached_result
+        
+        async with self.semaphore:
+            try:
+                response = await self.client.post(f"{self.api_url}/{endpoint}", content=_json_body(data), headers=JSON_HEADERS)
+                response.raise_for_status()
+                result = _json_loads(response.content)
+            except httpx.TimeoutException as e:
+                logger.error(f"Ollama API request timed out: {e}")
+                raise Exception(f"Ollama API request timed out: {e}")
+            except httpx.HTTPError as e:
+                logger.error(f"Ollama API request failed: {e}")
+                raise Exception(f"Ollama API request failed: {e}")
+        
+        if use_cache:
+            self.cache[cache_key] = (result, time.time())
+        return result
+    
+    async def generate_response(self, prompt: str, system_prompt: str = None, use_cache: bool = True, max_retries: int = 2,
+                                semantic: bool = False) -> str:
+        """
+        Generate a response using Ollama with retry logic.
+        
+        Args:
+            prompt: User prompt
+            system_prompt: System prompt (optional)
+            use_cache: Whether to use caching
+            max_retries: Maximum retry attempts
+            semantic: Also consult the semantic cache (see OllamaClient.generate_response)
             
-            # Ensure all statements are covered
-            covered_statements = {m.get("statement", "") for m in mapping}
-            for statement in statements:
-                if statement not in covered_statements:
-                    mapping.append({
-                        "statement": statement,
-                        "position": "pass"
-                    })
+        Returns:
+            Generated response
+        """
+        if use_cache:
+            exact_key = self._exact_key(prompt, system_prompt)
+            cached = self._exact_get(exact_key)
+            if cached is not None:
+                return cached
+        
+        # Embedding the key is CPU work, so it runs off the event loop
+        semantic_cache = self.semantic_cache if use_cache and semantic else None
+        if semantic_cache is not None:
+            cached = await asyncio.to_thread(semantic_cache.get, self.model, system_prompt, prompt)
+            if cached is not None:
+                return cached
+        
+        data = self._chat_payload(prompt, system_prompt)
+        
+        for attempt in range(max_retries + 1):
+            try:
+                response = await self._make_request("chat", data, use_cache)
+                text = response.get("message", {}).get("content", "")
+                if use_cache:
+                    self._exact_put(exact_key, text)
+                if semantic_cache is not None:
+                    await asyncio.to_thread(semantic_cache.put, self.model, system_prompt, prompt, text)
+                return text
+            except Exception as e:
+                logger.error(f"Attempt {attempt + 1} failed: {e}")
+                if attempt < max_retries:
+                    await asyncio.sleep(2 ** attempt)  # Exponential backoff
+                else:
+                    logger.error(f"All attempts failed for prompt: {prompt[:100]}...")
+                    return f"Error generating response: {e}"
+    
+    async def map_response_to_statements(self, response_text: str, statements: List[str]) -> Dict[str, Any]:
+        """
+        Map an individual response to the extracted statements.
+        
+        Args:
+            response_text: The individual response to map
+            statements: List of extracted statements
             
-            return {"mapping": mapping}
+        Returns:
+            Dict containing the mapping results
+        """
+        if not statements:
+            return {"mapping": []}
+        
+        system_prompt, prompt = self._mapping_prompts(response_text, statements)
+        
+        try:
+            response = await self.generate_response(prompt, system_prompt, use_cache=True)
+            return self._parse_mapping(response, statements)
         except Exception as e:
             logger.error(f"Response mapping failed: {e}")
-            # Return default pass mapping for all statements
             return {"mapping": [{"statement": stmt, "position": "pass"} for stmt in statements]}
+    
+    async def map_responses_batch(self, responses: List[str], statements: List[str]) -> List[Dict[str, Any]]:
+        """
+        Map many responses to the same statements concurrently.
+        
+        Args:
+            responses: Response texts to map
+            statements: List of extracted statements
+            
+        Returns:
+            One mapping result per response, in input order
+        """
+        return await asyncio.gather(*[self.map_response_to_statements(r, statements) for r in responses])
 
 # Global Ollama client instance
-ollama_client = OllamaClient() 
\ No newline at end of file
+ollama_client = OllamaClient(semantic_cache=_semantic_cache_from_env())
\ No newline at end of file
@@ -0,0 +1,45 @@
+"""
+Test cases for the NLP service clustering endpoints
+"""
+
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("sklearn")
+pytest.importorskip("fastapi")
+
+from fastapi.testclient import TestClient
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# The service imports its packages relative to its own directory
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "nlp_service"))
+
+main = pytest.importorskip("main")
+
+
+RESPONSES = [
+    "We need more bike lanes downtown",
+    "Protected bike lanes would make cycling safer",
+    "Bike lanes on Main Street are a priority",
+    "The library should stay open later",
+    "Longer library hours would help students",
+    "Please extend evening library hours",
+]
+
+
+def test_complete_analysis_serializes_clustering(monkeypatch):
+    """Clustering float32 TF-IDF embeddings returns JSON, not a 500 from numpy scalars"""
+    def tfidf_embeddings(texts):
+        return list(TfidfVectorizer().fit_transform(texts).toarray().astype(np.float32))
+    
+    monkeypatch.setattr(main.embeddings_generator, "generate_embeddings_batch", tfidf_embeddings)
+    
+    response = TestClient(main.app).post("/clustering/complete-analysis", json={"responses": RESPONSES})
+    
+    assert response.status_code == 200, response.text
+    clustering = response.json()["clustering"]
+    assert clustering["total_responses"] == len(RESPONSES)
+    assert all(isinstance(cluster["coherence_score"], float) for cluster in clustering["clusters"])
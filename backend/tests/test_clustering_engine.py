@@ -0,0 +1,46 @@
+"""
+Test cases for the response clustering engine
+"""
+
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("sklearn")
+
+from nlp_service.core.clustering_engine import ClusteringEngine, ClusterConfig
+
+
+def _two_groups():
+    """Six responses whose embeddings form two well-separated groups"""
+    rng = np.random.default_rng(0)
+    responses = [f"response {i}" for i in range(6)]
+    embeddings = list(np.vstack([
+        rng.normal(0.0, 0.01, (3, 8)),
+        rng.normal(1.0, 0.01, (3, 8)),
+    ]).astype(np.float32))
+    return responses, embeddings
+
+
+def test_hierarchical_clustering():
+    """Clustering with algorithm="hierarchical" returns clusters instead of raising"""
+    responses, embeddings = _two_groups()
+    result = ClusteringEngine().cluster_responses(responses, embeddings, ClusterConfig(algorithm="hierarchical"))
+    
+    assert result["algorithm_used"] == "hierarchical"
+    assert result["total_clusters"] == 2
+    assert sorted(i for cluster in result["clusters"] for i in cluster["response_indices"]) == list(range(6))
+
+
+def test_clustering_result_is_json_serializable():
+    """float32 embeddings still yield plain-float scores that the JSON encoder accepts"""
+    encoders = pytest.importorskip("fastapi.encoders")
+    
+    responses, embeddings = _two_groups()
+    result = ClusteringEngine().cluster_responses(responses, embeddings)
+    
+    assert all(type(cluster["coherence_score"]) is float for cluster in result["clusters"])
+    for key in ("average_coherence", "min_coherence", "max_coherence"):
+        assert type(result["statistics"][key]) is float
+    json.dumps(encoders.jsonable_encoder(result))
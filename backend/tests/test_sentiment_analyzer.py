@@ -0,0 +1,21 @@
+"""
+Test cases for the civic sentiment analyzer
+"""
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("textblob")
+
+from nlp_service.core.sentiment_analyzer import SentimentAnalyzer
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("I am so happy!", {"joy"}),
+    ("I am worried.", {"fear", "concern"}),
+    ("We feel hopeful, honestly", {"hope"}),
+])
+def test_emotions_match_punctuated_words(text, expected):
+    """Keywords ending a sentence or clause are still detected"""
+    result = SentimentAnalyzer().analyze_sentiment(text)
+    assert expected <= set(result["emotional_indicators"])